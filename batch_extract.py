@@ -0,0 +1,160 @@
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from extract_from_rsu36_file.pipeline import fit_file, save_result, save_snapshot_workbook
+
+
+def collect_pdf_files(inputs):
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            files.extend(glob.glob(os.path.join(item, "*.pdf")))
+        else:
+            files.extend(glob.glob(item))
+
+    # Keep the order stable and drop duplicates from overlapping patterns
+    return sorted(set(files))
+
+
+def _extract_one(pdf_path, output_dir, output_format="xlsx", with_records=False, snapshot_dir=None):
+    started = time.perf_counter()
+    try:
+        fitter = fit_file(pdf_path)
+        result = fitter.result()
+        if output_format == "xlsx" and snapshot_dir is not None:
+            output_path = save_snapshot_workbook(fitter, snapshot_dir, output_dir, result)
+        elif output_format == "xlsx":
+            output_path = fitter.generate_excel_file(output_dir=output_dir, result=result)
+        else:
+            output_path = save_result(result, output_dir, output_format)
+
+        records = None
+        if with_records:
+            from extract_from_rsu36_file.parquet_export import plan_records
+            records = plan_records(fitter, result.allocation)
+
+        return pdf_path, output_path, records, None, time.perf_counter() - started
+    except Exception as e:
+        return pdf_path, None, None, f"{type(e).__name__}: {e}", time.perf_counter() - started
+
+
+def _run_pool(pdf_files, workers, args):
+    """
+    Yield (path, _extract_one result) as files finish, in completion order.
+    The result is None for the files a dead worker process took down with
+    the pool (killed, or a crash in the PDF parser).
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_extract_one, path, *args): path for path in pdf_files}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                yield path, future.result()
+            except BrokenProcessPool:
+                yield path, None
+            except Exception as e:
+                yield path, (path, None, None, f"{type(e).__name__}: {e}", 0.0)
+
+
+def run_batch(pdf_files, output_dir, workers=None, parquet_dir=None, parquet_batch_size=500, output_format="xlsx", snapshot_dir=None):
+    os.makedirs(output_dir, exist_ok=True)
+
+    succeeded = []
+    failed = []
+
+    # Course records are appended to the Parquet dataset every `parquet_batch_size` students
+    writer = None
+    pending_records = []
+    pending_students = 0
+    if parquet_dir is not None:
+        from extract_from_rsu36_file.parquet_export import ParquetDatasetWriter
+        writer = ParquetDatasetWriter(parquet_dir)
+
+    def record(result):
+        nonlocal pending_records, pending_students
+        pdf_path, output_path, records, error, elapsed = result
+        done = len(succeeded) + len(failed) + 1
+        if error is None:
+            succeeded.append((pdf_path, output_path))
+            print(f"[{done}/{len(pdf_files)}] OK   {pdf_path} -> {output_path} ({elapsed:.2f}s)")
+        else:
+            failed.append((pdf_path, error))
+            print(f"[{done}/{len(pdf_files)}] FAIL {pdf_path}: {error}")
+
+        if records:
+            pending_records.extend(records)
+            pending_students += 1
+            if pending_students >= parquet_batch_size:
+                writer.write(pending_records)
+                pending_records, pending_students = [], 0
+
+    args = (output_dir, output_format, writer is not None, snapshot_dir)
+    started = time.perf_counter()
+
+    # When a worker dies, the files it took down with the pool are retried
+    # on a new pool; files lost a second time run one per process, so only
+    # the file that kills its worker is reported as failed.
+    remaining = list(pdf_files)
+    for _ in range(2):
+        lost = set()
+        for path, result in _run_pool(remaining, workers, args):
+            if result is None:
+                lost.add(path)
+            else:
+                record(result)
+        remaining = [path for path in remaining if path in lost]
+        if not remaining:
+            break
+        print(f"A worker process died; retrying {len(remaining)} unfinished files")
+
+    for path in remaining:
+        for _, result in _run_pool([path], 1, args):
+            record(result or (path, None, None, "worker process died", 0.0))
+
+    if writer is not None:
+        writer.write(pending_records)
+
+    return succeeded, failed, time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract course plans from many RSU36 PDF files in parallel.")
+    parser.add_argument("inputs", nargs="+", help="PDF files, directories or glob patterns")
+    parser.add_argument("-o", "--output-dir", default="course_plans", help="Directory for the generated course plans")
+    parser.add_argument("-f", "--format", choices=("xlsx", "json", "csv"), default="xlsx",
+                        help="xlsx fills the course plan template; json and csv only write the group assignments")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--parquet", metavar="DIR", default=None, help="Also append every course record to a partitioned Parquet dataset in DIR")
+    parser.add_argument("--parquet-batch-size", type=int, default=500, help="Students per Parquet write (default: 500)")
+    parser.add_argument("--snapshots", metavar="DIR", default=None,
+                        help="Keep each student's last plan in DIR and only patch the cells that changed since then")
+    args = parser.parse_args(argv)
+
+    pdf_files = collect_pdf_files(args.inputs)
+    if not pdf_files:
+        print("No PDF files found.")
+        return 1
+
+    succeeded, failed, total_time = run_batch(
+        pdf_files, args.output_dir, args.workers,
+        parquet_dir=args.parquet, parquet_batch_size=args.parquet_batch_size, output_format=args.format,
+        snapshot_dir=args.snapshots
+    )
+
+    print()
+    print(f"Processed {len(pdf_files)} files in {total_time:.2f}s "
+          f"({len(pdf_files) / total_time:.1f} files/s) with {args.workers} workers")
+    print(f"Succeeded: {len(succeeded)}  Failed: {len(failed)}")
+    for pdf_path, error in failed:
+        print(f"  {pdf_path}: {error}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
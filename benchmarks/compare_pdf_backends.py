@@ -0,0 +1,77 @@
+"""
+Check the pdfium extraction backend against pdfplumber: both must give the
+same student information and course lines for every document.
+
+    python -m benchmarks.compare_pdf_backends --students 100
+    python -m benchmarks.compare_pdf_backends rsu36_forms/*.pdf
+"""
+import argparse
+import glob
+import io
+import statistics
+import sys
+import time
+
+from benchmarks.synthetic_pdfs import make_corpus
+from extract_from_rsu36_file.course_extractor import CourseExtractor
+
+
+def _diff(pdfium_data, pdfplumber_data):
+    problems = []
+    if pdfium_data["information"] != pdfplumber_data["information"]:
+        problems.append(f"information: pdfium={pdfium_data['information']} pdfplumber={pdfplumber_data['information']}")
+
+    pdfium_courses = pdfium_data["courses"]
+    pdfplumber_courses = pdfplumber_data["courses"]
+    if pdfium_courses != pdfplumber_courses:
+        only_pdfium = [line for line in pdfium_courses if line not in pdfplumber_courses]
+        only_pdfplumber = [line for line in pdfplumber_courses if line not in pdfium_courses]
+        problems.append(f"courses: only pdfium {only_pdfium[:5]}, only pdfplumber {only_pdfplumber[:5]}"
+                        + ("" if only_pdfium or only_pdfplumber else " (same lines, different order)"))
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the pdfium and pdfplumber RSU36 extraction backends.")
+    parser.add_argument("pdfs", nargs="*", help="RSU36 PDFs or glob patterns (default: a synthetic corpus)")
+    parser.add_argument("--students", type=int, default=50, help="Synthetic students when no PDFs are given")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.pdfs:
+        documents = []
+        for pattern in args.pdfs:
+            for path in sorted(glob.glob(pattern)):
+                with open(path, "rb") as f:
+                    documents.append((path, f.read()))
+    else:
+        documents = [(f"synthetic {student_id}", rsu36) for student_id, rsu36, _, _ in make_corpus(args.students, seed=args.seed)]
+
+    extractor = CourseExtractor()
+    timings = {"pdfium": [], "pdfplumber": []}
+    mismatches = 0
+
+    for name, data in documents:
+        results = {}
+        for backend in timings:
+            started = time.perf_counter()
+            results[backend] = extractor.extract_from_rsu36(io.BytesIO(data), backend=backend)
+            timings[backend].append(time.perf_counter() - started)
+
+        problems = _diff(results["pdfium"], results["pdfplumber"])
+        if problems:
+            mismatches += 1
+            print(f"MISMATCH {name}")
+            for problem in problems:
+                print(f"    {problem}")
+
+    print(f"{len(documents)} documents, {mismatches} mismatches")
+    for backend, values in timings.items():
+        print(f"{backend:<12} p50 {statistics.median(values) * 1000:8.2f} ms   mean {statistics.mean(values) * 1000:8.2f} ms")
+    print(f"pdfium speed-up: {statistics.mean(timings['pdfplumber']) / statistics.mean(timings['pdfium']):.1f}x")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+Per-page cost of reading the GPA transcript table with the fixed layout
+profile against pdfplumber's extract_tables. Both must give the same rows.
+
+    python -m benchmarks.gpa_layout_benchmark --students 30
+    python -m benchmarks.gpa_layout_benchmark transcripts/*.pdf
+    python -m benchmarks.gpa_layout_benchmark --calibrate transcripts/*.pdf
+
+--calibrate prints the column rulings found on real transcripts instead,
+for the "columns" of database/gpa_transcript_layout.json.
+
+The page's characters are parsed before either is timed, so only the table
+step is compared (pdfminer's layout analysis is the same for both).
+The synthetic run also checks a transcript whose long subject names wrap
+inside their ruled row: the fixed layout must turn those pages down (or
+read them like extract_tables) and every subject must come out whole.
+Timings on the synthetic corpus say nothing about real transcripts until
+the profile is calibrated on them.
+"""
+import argparse
+import collections
+import glob
+import io
+import json
+import random
+import statistics
+import sys
+import time
+
+import pdfplumber
+
+from benchmarks.synthetic_pdfs import COURSE_NAMES, make_corpus, make_gpa_transcript_pdf, random_student_courses
+from extract_from_gpa_file.scrape_subjects import clean_row, iter_subjects
+from extract_from_gpa_file.transcript_layout import ruling_columns, transcript_layout
+
+
+def _clean(rows):
+    return [row for row in (clean_row(row) for row in rows) if row]
+
+
+def check_wrapped_names(seed):
+    """
+    Read a transcript whose long names wrap onto a second line inside one
+    ruled row. Returns the number of subjects that did not come out whole.
+    """
+    courses = random_student_courses(random.Random(seed), n_courses=60)
+    expected = [(code, credit, grade) for code, credit, grade, _, _ in courses if grade is not None]
+    transcript = make_gpa_transcript_pdf(courses, seed=seed, wrapped_names=True)
+    subjects = list(iter_subjects(transcript))
+
+    broken = 0
+    layout = transcript_layout()
+    with pdfplumber.open(io.BytesIO(transcript)) as pdf:
+        for page in pdf.pages:
+            rows = layout.extract_rows(page)
+            if rows is not None and _clean(rows) != _clean(row for table in page.extract_tables(layout.table_settings) for row in table):
+                broken += 1
+            page.close()
+
+    names = {" ".join(name.split()) for name in COURSE_NAMES}
+    broken += sum(1 for subject in subjects if " ".join(subject["name"].split()) not in names)
+    if sorted((s["code"], s["credit"], s["grade"]) for s in subjects) != sorted(expected):
+        broken += 1
+    wrapped = sum(1 for subject in subjects if "\n" in subject["name"])
+    print(f"wrapped names: {len(subjects)} subjects, {wrapped} wrapped, {broken} broken")
+    return broken
+
+
+def calibrate(documents, tolerance):
+    """Print each page's vertical rulings and the most common set across pages."""
+    seen = collections.Counter()
+    for name, data in documents:
+        with pdfplumber.open(io.BytesIO(data)) as pdf:
+            for number, page in enumerate(pdf.pages, 1):
+                columns = ruling_columns(page, tolerance)
+                print(f"{name} page {number}: {columns}")
+                seen[tuple(columns)] += 1
+                page.close()
+
+    if not seen:
+        print("No pages")
+        return 1
+    columns, pages = seen.most_common(1)[0]
+    print(f"{pages} of {sum(seen.values())} pages share these rulings:")
+    print(json.dumps({"columns": list(columns), "column_tolerance": tolerance}))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the fixed-layout GPA table reader with extract_tables.")
+    parser.add_argument("pdfs", nargs="*", help="GPA transcripts or glob patterns (default: a synthetic corpus)")
+    parser.add_argument("--students", type=int, default=30, help="Synthetic students when no PDFs are given")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--calibrate", action="store_true", help="Print the column rulings of the transcripts instead")
+    parser.add_argument("--tolerance", type=float, default=2, help="Rulings closer than this are one column (--calibrate)")
+    args = parser.parse_args(argv)
+
+    if args.pdfs:
+        documents = []
+        for pattern in args.pdfs:
+            for path in sorted(glob.glob(pattern)):
+                with open(path, "rb") as f:
+                    documents.append((path, f.read()))
+    else:
+        documents = [(f"synthetic {student_id}", transcript) for student_id, _, transcript, _ in make_corpus(args.students, seed=args.seed)]
+
+    if args.calibrate:
+        return calibrate(documents, args.tolerance)
+
+    layout = transcript_layout()
+    if not layout.calibrated:
+        print("The layout profile is uncalibrated: the scraper does not use it yet")
+    timings = {"extract_tables": [], "fixed_layout": []}
+    pages = not_fitting = mismatches = 0
+
+    for name, data in documents:
+        with pdfplumber.open(io.BytesIO(data)) as pdf:
+            for number, page in enumerate(pdf.pages, 1):
+                page.chars  # parse the page before timing
+
+                started = time.perf_counter()
+                tables = page.extract_tables(layout.table_settings)
+                timings["extract_tables"].append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                rows = layout.extract_rows(page)
+                timings["fixed_layout"].append(time.perf_counter() - started)
+
+                pages += 1
+                if rows is None:
+                    not_fitting += 1
+                    print(f"NOT FITTING {name} page {number}")
+                elif _clean(rows) != _clean(row for table in tables for row in table):
+                    mismatches += 1
+                    print(f"MISMATCH {name} page {number}")
+                page.close()
+
+    print(f"{len(documents)} documents, {pages} pages, {not_fitting} not fitting the layout, {mismatches} mismatches")
+    for method, values in timings.items():
+        print(f"{method:<16} p50 {statistics.median(values) * 1000:8.2f} ms   mean {statistics.mean(values) * 1000:8.2f} ms per page")
+    print(f"fixed layout speed-up: {statistics.mean(timings['extract_tables']) / statistics.mean(timings['fixed_layout']):.1f}x")
+
+    broken = 0 if args.pdfs else check_wrapped_names(args.seed)
+
+    return 1 if mismatches or broken else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Peak memory of concurrent extractions. `--concurrency` worker processes,
+spawned and warmed up like the JobQueue's, run full extractions (PDF to
+workbook) side by side and report their peak RSS.
+
+    python -m benchmarks.memory_benchmark --concurrency 4 --students 40
+    COURSE_PLAN_RSS_BUDGET_MB=800 python -m benchmarks.memory_benchmark --concurrency 8
+
+Fails when the workers' combined peak RSS goes over the budget
+(--budget-mb, or COURSE_PLAN_RSS_BUDGET_MB). Linux and macOS only.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import resource
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.synthetic_pdfs import make_corpus, make_rsu36_pdf, random_student_courses
+from extract_from_rsu36_file.job_queue import extract_job
+from extract_from_rsu36_file.warmup import warm_up
+
+DEFAULT_BUDGET_MB = 64  # per concurrent extraction
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _current_rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except OSError:
+        return None
+
+
+def _measure(pdf=None):
+    """Run one extraction (or nothing, for the warmed-up baseline) and report this worker's memory."""
+    if pdf is not None:
+        extract_job(pdf)
+    return os.getpid(), _peak_rss_mb(), _current_rss_mb()
+
+
+def _documents(students, long_pages, seed):
+    documents = [rsu36 for _, rsu36, _, _ in make_corpus(students, seed=seed)]
+    if long_pages:
+        # A few long forms, the worst case for the parsers' page caches
+        rng = random.Random(seed)
+        for i in range(max(1, students // 10)):
+            courses = random_student_courses(rng, n_courses=60 * long_pages)
+            documents.append(make_rsu36_pdf(courses, student_id=f"69{i:05d}", pages=long_pages, seed=seed + i))
+    return documents
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure peak RSS of concurrent extractions against a budget.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Extractions running at once (worker processes)")
+    parser.add_argument("--students", type=int, default=40, help="Synthetic RSU36 forms")
+    parser.add_argument("--long-pages", type=int, default=6, help="Pages of the extra long forms (0: none)")
+    parser.add_argument("--rounds", type=int, default=3, help="Passes over the documents")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget-mb", type=float,
+                        default=float(os.environ.get("COURSE_PLAN_RSS_BUDGET_MB", 0)) or None,
+                        help=f"Combined peak RSS budget (default {DEFAULT_BUDGET_MB} MB per concurrent extraction)")
+    args = parser.parse_args(argv)
+
+    budget = args.budget_mb or DEFAULT_BUDGET_MB * args.concurrency
+    documents = _documents(args.students, args.long_pages, args.seed)
+    context = multiprocessing.get_context("spawn")
+
+    # What a worker holds before its first extraction
+    with ProcessPoolExecutor(max_workers=1, mp_context=context, initializer=warm_up) as executor:
+        _, warm_peak, warm_rss = executor.submit(_measure).result()
+
+    peaks = {}
+    first_rss = {}
+    last_rss = {}
+    with ProcessPoolExecutor(max_workers=args.concurrency, mp_context=context, initializer=warm_up) as executor:
+        futures = [executor.submit(_measure, pdf) for _ in range(args.rounds) for pdf in documents]
+        for future in futures:
+            pid, peak, rss = future.result()
+            peaks[pid] = max(peaks.get(pid, 0), peak)
+            first_rss.setdefault(pid, rss)
+            last_rss[pid] = rss
+
+    total_peak = sum(peaks.values())
+    print(f"{len(futures)} extractions ({len(documents)} documents x {args.rounds}), {args.concurrency} at a time")
+    print(f"warmed-up worker      peak {warm_peak:8.1f} MB   rss {warm_rss or 0:8.1f} MB")
+    print(f"busiest worker        peak {max(peaks.values()):8.1f} MB "
+          f"(+{max(peaks.values()) - warm_peak:.1f} MB over warmed-up)")
+    if None not in last_rss.values():
+        growth = max(last_rss[pid] - first_rss[pid] for pid in last_rss)
+        print(f"largest rss growth    {growth:8.1f} MB between a worker's first and last extraction")
+    print(f"combined peak         {total_peak:8.1f} MB   budget {budget:.1f} MB")
+
+    if total_peak > budget:
+        print(f"FAIL: combined peak RSS {total_peak:.1f} MB is over the {budget:.1f} MB budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+End-to-end benchmark for the extraction pipeline on synthetic documents.
+
+    python -m benchmarks.run_benchmarks --students 50
+    python -m benchmarks.run_benchmarks --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --compare benchmarks/baseline.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from benchmarks.synthetic_pdfs import make_corpus
+from extract_from_gpa_file.scrape_subjects import get_all_subjects, iter_subjects, start_scrapping
+from extract_from_rsu36_file.course_extractor import CourseExtractor
+from extract_from_rsu36_file.course_plan_fitter import CoursePlanFitter
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    index = (len(values) - 1) * pct / 100
+    lower = int(index)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (index - lower)
+
+
+def _fitted(data):
+    fitter = CoursePlanFitter()
+    fitter.fit(data)
+    return fitter
+
+
+def build_stages(corpus):
+    """Return {stage name: [zero-argument callables, one per document]}."""
+    extracted = [CourseExtractor().extract_from_rsu36(io.BytesIO(rsu36)) for _, rsu36, _, _ in corpus]
+    fitters = [_fitted(data) for data in extracted]
+
+    return {
+        "extract_from_rsu36": [
+            lambda pdf=rsu36: CourseExtractor().extract_from_rsu36(io.BytesIO(pdf)) for _, rsu36, _, _ in corpus
+        ],
+        "extract_pdfplumber": [
+            lambda pdf=rsu36: CourseExtractor().extract_from_rsu36(io.BytesIO(pdf), backend="pdfplumber")
+            for _, rsu36, _, _ in corpus
+        ],
+        "fit": [lambda data=data: _fitted(data) for data in extracted],
+        "generate_excel_file": [lambda fitter=fitter: fitter.generate_excel_file(is_web=True) for fitter in fitters],
+        "gpa_start_scrapping": [
+            lambda pdf=transcript: get_all_subjects(start_scrapping(io.BytesIO(pdf))[1:])
+            for _, _, transcript, _ in corpus
+        ],
+        "gpa_iter_subjects": [
+            lambda pdf=transcript: list(iter_subjects(io.BytesIO(pdf))) for _, _, transcript, _ in corpus
+        ],
+    }
+
+
+def measure(calls, repeat):
+    timings = []
+    for _ in range(repeat):
+        for call in calls:
+            started = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - started)
+
+    # Memory is measured in a separate pass, tracemalloc slows everything down
+    peak = 0
+    for call in calls:
+        tracemalloc.start()
+        call()
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    return {
+        "runs": len(timings),
+        "mean_ms": statistics.mean(timings) * 1000,
+        "p50_ms": percentile(timings, 50) * 1000,
+        "p90_ms": percentile(timings, 90) * 1000,
+        "p99_ms": percentile(timings, 99) * 1000,
+        "throughput_per_s": len(timings) / sum(timings),
+        "peak_memory_mb": peak / (1024 * 1024),
+    }
+
+
+def print_report(results):
+    header = f"{'stage':<22}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'mean ms':>10}{'ops/s':>10}{'peak MB':>10}"
+    print(header)
+    print("-" * len(header))
+    for stage, r in results.items():
+        print(f"{stage:<22}{r['p50_ms']:>10.2f}{r['p90_ms']:>10.2f}{r['p99_ms']:>10.2f}"
+              f"{r['mean_ms']:>10.2f}{r['throughput_per_s']:>10.1f}{r['peak_memory_mb']:>10.2f}")
+
+
+def compare(results, baseline, threshold):
+    """Print the change against a saved baseline and return the regressed stages."""
+    regressions = []
+    print()
+    print(f"{'stage':<22}{'base p50':>10}{'now p50':>10}{'change':>10}{'base MB':>10}{'now MB':>10}")
+    for stage, r in results.items():
+        base = baseline["results"].get(stage)
+        if base is None:
+            print(f"{stage:<22}{'(new)':>10}")
+            continue
+
+        change = (r["p50_ms"] - base["p50_ms"]) / base["p50_ms"]
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(stage)
+        print(f"{stage:<22}{base['p50_ms']:>10.2f}{r['p50_ms']:>10.2f}{change:>+10.1%}"
+              f"{base['peak_memory_mb']:>10.2f}{r['peak_memory_mb']:>10.2f}{flag}")
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the course plan pipeline on synthetic PDFs.")
+    parser.add_argument("--students", type=int, default=30, help="Number of synthetic students")
+    parser.add_argument("--min-courses", type=int, default=30)
+    parser.add_argument("--max-courses", type=int, default=70)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes over the corpus per stage")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stages", nargs="*", help="Only run these stages")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write the results to a baseline JSON file")
+    parser.add_argument("--compare", metavar="PATH", help="Compare against a baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed p50 slowdown before flagging (default 20%%)")
+    args = parser.parse_args(argv)
+
+    corpus = list(make_corpus(args.students, seed=args.seed, min_courses=args.min_courses, max_courses=args.max_courses))
+    print(f"Synthetic corpus: {len(corpus)} students, "
+          f"{sum(len(courses) for *_, courses in corpus)} course lines")
+
+    # The pipeline prints progress; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        stages = build_stages(corpus)
+        results = {}
+        for stage, calls in stages.items():
+            if args.stages and stage not in args.stages:
+                continue
+            results[stage] = measure(calls, args.repeat)
+
+    print_report(results)
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "students": args.students,
+        "seed": args.seed,
+        "results": results,
+    }
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+        print(f"\nBaseline saved to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+Import-time and cold-start benchmark. Every measurement runs in a fresh
+interpreter, so nothing is cached between runs.
+
+    python -m benchmarks.startup_benchmark
+    python -m benchmarks.startup_benchmark --save-baseline benchmarks/startup_baseline.json
+    python -m benchmarks.startup_benchmark --compare benchmarks/startup_baseline.json
+
+Also fails when an entry module pulls in one of HEAVY_MODULES at import
+time; those must only be imported where they are used.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules the app, CLIs and HTTP service import before any work is done
+ENTRY_MODULES = (
+    "extract_from_rsu36_file.pipeline",
+    "extract_from_rsu36_file.job_queue",
+    "extract_from_rsu36_file.result_cache",
+    "batch_extract",
+    "http_service",
+    "streamlit_resources",
+)
+
+HEAVY_MODULES = ("pdfplumber", "pdfminer", "openpyxl", "pandas", "pyarrow")
+
+COLD_START_SCRIPT = """
+import io, json, time
+started = time.perf_counter()
+from extract_from_rsu36_file.pipeline import run_pipeline
+from extract_from_rsu36_file.warmup import warm_up
+imported = time.perf_counter()
+if {warm}:
+    warm_up()
+warmed = time.perf_counter()
+with open({pdf!r}, "rb") as f:
+    pdf = f.read()
+run_pipeline(io.BytesIO(pdf))
+first = time.perf_counter()
+run_pipeline(io.BytesIO(pdf))
+second = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "warm_up_ms": (warmed - imported) * 1000,
+    "first_request_ms": (first - warmed) * 1000,
+    "second_request_ms": (second - first) * 1000,
+}}))
+"""
+
+
+def _run(args):
+    return subprocess.run([sys.executable, *args], cwd=REPO_DIR, capture_output=True, text=True)
+
+
+def import_time_ms(module):
+    """Cumulative import time of `module` in a fresh interpreter, or None if it cannot be imported."""
+    process = _run(["-X", "importtime", "-c", f"import {module}"])
+    if process.returncode != 0:
+        return None
+
+    for line in reversed(process.stderr.splitlines()):
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000
+    return None
+
+
+def heavy_imports(module):
+    code = f"import sys, json, {module}; print(json.dumps(sorted({{m.split('.')[0] for m in sys.modules}} & set({list(HEAVY_MODULES)!r}))))"
+    process = _run(["-c", code])
+    return json.loads(process.stdout) if process.returncode == 0 else None
+
+
+def cold_start(pdf_path, warm):
+    process = _run(["-c", COLD_START_SCRIPT.format(pdf=pdf_path, warm=warm)])
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr)
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def _median_dicts(runs):
+    return {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure import time and first-request latency in fresh interpreters.")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per measurement (median is reported)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write the results to a baseline JSON file")
+    parser.add_argument("--compare", metavar="PATH", help="Compare against a baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=0.3, help="Allowed slowdown before flagging (default 30%%)")
+    args = parser.parse_args(argv)
+
+    failures = []
+    results = {}
+
+    print(f"{'entry module':<40}{'import ms':>12}  heavy imports")
+    for module in ENTRY_MODULES:
+        timings = [import_time_ms(module) for _ in range(args.repeat)]
+        if None in timings:
+            print(f"{module:<40}{'(unavailable)':>12}")
+            continue
+
+        heavy = heavy_imports(module) or []
+        results[f"import {module}"] = statistics.median(timings)
+        print(f"{module:<40}{results[f'import {module}']:>12.1f}  {', '.join(heavy) or '-'}")
+        if heavy:
+            failures.append(f"{module} imports {', '.join(heavy)} at import time")
+
+    # A tiny form written next to the report, so the subprocesses can read it
+    from extract_from_rsu36_file.warmup import warmup_pdf
+
+    pdf_path = os.path.join(REPO_DIR, "benchmarks", ".startup_sample.pdf")
+    with open(pdf_path, "wb") as f:
+        f.write(warmup_pdf())
+    try:
+        print()
+        print(f"{'cold start':<14}{'import ms':>12}{'warm-up ms':>12}{'1st req ms':>12}{'2nd req ms':>12}")
+        for warm in (False, True):
+            label = "warmed" if warm else "not warmed"
+            run = _median_dicts([cold_start(pdf_path, warm) for _ in range(args.repeat)])
+            print(f"{label:<14}{run['import_ms']:>12.1f}{run['warm_up_ms']:>12.1f}"
+                  f"{run['first_request_ms']:>12.1f}{run['second_request_ms']:>12.1f}")
+            for key, value in run.items():
+                results[f"{label} {key}"] = value
+    finally:
+        os.remove(pdf_path)
+
+    report = {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+        print(f"\nBaseline saved to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+        print()
+        for name, value in results.items():
+            base = baseline.get(name)
+            if not base:
+                continue
+            change = (value - base) / base
+            flag = ""
+            # First-request and import times are what users wait for; ignore
+            # changes of a few milliseconds, which are mostly noise
+            if change > args.threshold and value - base > 5 and not name.endswith(("warm_up_ms", "second_request_ms")):
+                flag = "  REGRESSION"
+                failures.append(f"{name}: {base:.1f} -> {value:.1f} ms")
+            print(f"{name:<50}{base:>10.1f}{value:>10.1f}{change:>+10.1%}{flag}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
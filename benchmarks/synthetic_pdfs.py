@@ -0,0 +1,307 @@
+"""
+Synthetic RSU36 forms and GPA transcripts for benchmarking.
+
+The PDFs are written by hand (no extra dependency) and only aim to look like
+the real documents to the extractors: same regions, same line formats and the
+same (pdfminer-decoded) Thai header words. Thai text is emitted through a
+simple font whose ToUnicode map points byte codes at Thai characters, so the
+glyphs do not render nicely in a viewer but extract exactly like the originals.
+"""
+import random
+import zlib
+
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+
+NAME_LABEL = "นามสกกล"
+ID_LABEL = "รหหสประจจาตหว"
+FACULTY_THAI = "เทคโนโลยยสารสนเทศและการสสสอสาร"
+FORM_TITLE = "ใบแสดงผลการเรยยนตามโครงสรรางหลลกสสตร"
+THAI_NAMES = ["สมชาย ใจด", "สมหญิง รกเรยน", "วรรณา ทองด", "ประเสรฐ มนคง", "กมลา ศรสข"]
+
+GE_CODES = [
+    "IRS111", "IRS112", "ILE121", "ILE122", "ENL123", "THA121", "IRS131", "RSU141",
+    "IRS151", "RSU161", "IRS171", "RSU181", "IRS142", "RSU172",
+]
+SPECIALIZED_CODES = [
+    "ICT111", "ICT112", "MAT153", "ITE201", "ICT101", "ICT102", "ICT103", "ICT110",
+    "ICT202", "ICT209", "ICT210", "ICT211", "ICT212", "ICT213", "ICT215", "ICT301",
+    "ICT302", "ICT304", "ICT305", "ICT401", "ICT402", "ICT493", "ICT494", "ICT495",
+    "ICT498", "ICT214", "ICT320", "ICT324", "ICT325", "ICT328", "ICT329", "ICT331",
+    "IBM221", "IEG350",
+]
+FREE_CODES = ["ACC101", "BUS205", "JPN101", "CHN102", "ART110", "MUS105", "PSY101", "ECO100"]
+GRADES = ["A", "B+", "B", "C+", "C", "D+", "D", "F", "W"]
+COURSE_NAMES = [
+    "INTRODUCTION TO PROGRAMMING", "DATA STRUCTURES AND ALGORITHMS", "COMPUTER NETWORKS",
+    "DATABASE SYSTEMS", "ENGLISH FOR COMMUNICATION", "DIGITAL MEDIA LITERACY",
+    "ENTREPRENEURSHIP AND INNOVATION FOR THE DIGITAL ECONOMY", "CALCULUS", "ART APPRECIATION",
+]
+TERM_WORDS = {1: "FIRST SEMESTER", 2: "SECOND SEMESTER", 3: "SUMMER SESSION"}
+
+
+class _ThaiFont:
+    """Byte code <-> Thai character table for the ToUnicode font."""
+
+    def __init__(self, texts):
+        chars = sorted({ch for text in texts for ch in text if ord(ch) > 127})
+        self.codes = {ch: 128 + i for i, ch in enumerate(chars)}
+
+    def encode(self, text):
+        return bytes(self.codes.get(ch, ord(" ")) if ord(ch) > 127 else ord(ch) for ch in text)
+
+    def to_unicode_cmap(self):
+        entries = "\n".join(
+            f"<{code:02X}> <{ord(ch):04X}>" for ch, code in sorted(self.codes.items(), key=lambda i: i[1])
+        )
+        return (
+            "/CIDInit /ProcSet findresource begin 12 dict begin begincmap\n"
+            "/CMapName /Synthetic-Thai def /CMapType 2 def\n"
+            "1 begincodespacerange <00> <FF> endcodespacerange\n"
+            f"{len(self.codes)} beginbfchar\n{entries}\nendbfchar\n"
+            "endcmap CMapName currentdict /CMap defineresource pop end end"
+        ).encode("ascii")
+
+
+def _escape(data):
+    return data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+class _PdfWriter:
+    def __init__(self, thai_font=None):
+        self.objects = []
+        self.pages = []
+        self.thai_font = thai_font
+
+    def _add(self, body):
+        self.objects.append(body)
+        return len(self.objects)
+
+    def add_page(self, operations):
+        stream = zlib.compress("\n".join(operations).encode("latin-1"))
+        content = self._add(
+            b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        )
+        self.pages.append(content)
+
+    def to_bytes(self):
+        font_ids = {"F1": self._add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")}
+        if self.thai_font is not None and self.thai_font.codes:
+            cmap = self.thai_font.to_unicode_cmap()
+            cmap_id = self._add(b"<< /Length %d >>\nstream\n" % len(cmap) + cmap + b"\nendstream")
+            widths = b" ".join(b"550" for _ in range(256))
+            font_ids["F2"] = self._add(
+                b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /FirstChar 0 /LastChar 255 "
+                b"/Widths [" + widths + b"] /ToUnicode %d 0 R >>" % cmap_id
+            )
+        fonts = b" ".join(b"/%s %d 0 R" % (name.encode(), oid) for name, oid in font_ids.items())
+
+        pages_id = len(self.objects) + len(self.pages) + 1
+        page_ids = []
+        for content in self.pages:
+            page_ids.append(self._add(
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Resources << /Font << %s >> >> "
+                b"/Contents %d 0 R >>" % (pages_id, PAGE_WIDTH, PAGE_HEIGHT, fonts, content)
+            ))
+        kids = b" ".join(b"%d 0 R" % pid for pid in page_ids)
+        self._add(b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids)))
+        catalog = self._add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+        out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for i, body in enumerate(self.objects, 1):
+            offsets.append(len(out))
+            out += b"%d 0 obj\n" % i + body + b"\nendobj\n"
+        xref = len(out)
+        out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(self.objects) + 1)
+        for offset in offsets:
+            out += b"%010d 00000 n \n" % offset
+        out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+            len(self.objects) + 1, catalog, xref
+        )
+        return bytes(out)
+
+
+def _text(x, top, text, size=8, font="F1", thai_font=None):
+    y = PAGE_HEIGHT - top - size
+    data = thai_font.encode(text) if font == "F2" else text.encode("latin-1")
+    return f"BT /{font} {size} Tf {x:.2f} {y:.2f} Td (" + _escape(data).decode("latin-1") + ") Tj ET"
+
+
+def _student_terms(rng, years):
+    first_year = rng.randint(2563, 2566)
+    terms = []
+    for offset in range(years):
+        terms.append((1, first_year + offset))
+        terms.append((2, first_year + offset))
+        if rng.random() < 0.4:
+            terms.append((3, first_year + offset))
+    return terms
+
+
+def random_student_courses(rng, n_courses=48, retake_ratio=0.08, ungraded=4):
+    """Course tuples ``(code, credit, grade, term, thai_year)`` in study order."""
+    pool = GE_CODES + SPECIALIZED_CODES + FREE_CODES
+    codes = rng.sample(pool, min(n_courses, len(pool)))
+    while len(codes) < n_courses:
+        codes.append(rng.choice(pool))
+
+    terms = _student_terms(rng, years=max(1, -(-n_courses // 12)))
+    per_term = max(1, -(-len(codes) // len(terms)))
+    courses = []
+    for i, code in enumerate(codes):
+        term, year = terms[min(i // per_term, len(terms) - 1)]
+        courses.append((code, 3, rng.choice(GRADES), term, year))
+
+    for code, credit, _, term, year in rng.sample(courses, int(len(courses) * retake_ratio)):
+        courses.append((code, credit, rng.choice(GRADES[:6]), min(term + 1, 3), year))
+    for code in rng.sample(pool, ungraded):
+        courses.append((code, 3, None, None, None))
+    return courses
+
+
+RSU36_LINE_HEIGHT = 11
+RSU36_HEADER_BOTTOM = 100
+# Course rows per column; every page has two columns
+RSU36_FIRST_PAGE_ROWS = (PAGE_HEIGHT - RSU36_HEADER_BOTTOM - 20) // RSU36_LINE_HEIGHT
+RSU36_OTHER_PAGE_ROWS = (PAGE_HEIGHT - 60) // RSU36_LINE_HEIGHT
+
+
+def rsu36_pages(n_lines):
+    """Pages an RSU36 form needs for ``n_lines`` course lines."""
+    remaining = n_lines - 2 * RSU36_FIRST_PAGE_ROWS
+    return 1 + max(0, -(-remaining // (2 * RSU36_OTHER_PAGE_ROWS)))
+
+
+def make_rsu36_pdf(courses, student_id="6603731", name=None, pages=1, seed=0):
+    """Build an RSU36 form PDF with the given courses spread over ``pages`` pages."""
+    rng = random.Random(seed)
+    name = name or rng.choice(THAI_NAMES)
+    thai_font = _ThaiFont([NAME_LABEL, ID_LABEL, FACULTY_THAI, FORM_TITLE, name])
+    writer = _PdfWriter(thai_font)
+
+    lines = []
+    for i, (code, credit, grade, term, year) in enumerate(courses, 1):
+        line = f"{i} {code} {credit}"
+        if grade is not None:
+            line += f" {grade} {term}/{year}"
+        lines.append(line)
+
+    line_height = RSU36_LINE_HEIGHT
+    header_bottom = RSU36_HEADER_BOTTOM
+    first_rows, other_rows = RSU36_FIRST_PAGE_ROWS, RSU36_OTHER_PAGE_ROWS
+    chunks = []
+    start = 0
+    for page_number in range(pages):
+        rows = first_rows if page_number == 0 else other_rows
+        size = 2 * rows if page_number == pages - 1 else min(2 * rows, -(-(len(lines) - start) // (pages - page_number)))
+        chunks.append(lines[start:start + size])
+        start += size
+    if start < len(lines):
+        raise ValueError("too many courses for the requested page count")
+
+    for page_number, chunk in enumerate(chunks):
+        ops = []
+        top = 40
+        if page_number == 0:
+            ops.append(_text(200, 20, FORM_TITLE, 10, "F2", thai_font))
+            ops.append(_text(30, 45, f"{NAME_LABEL}  {name}", 9, "F2", thai_font))
+            ops.append(_text(300, 45, f"{ID_LABEL}  {student_id}", 9, "F2", thai_font))
+            ops.append(_text(30, 65, FACULTY_THAI, 9, "F2", thai_font))
+            top = header_bottom
+        rows = first_rows if page_number == 0 else other_rows
+        for i, line in enumerate(chunk):
+            column, row = divmod(i, rows)
+            x = 30 if column == 0 else PAGE_WIDTH / 2 + 15
+            ops.append(_text(x, top + row * line_height, line))
+        writer.add_page(ops)
+    return writer.to_bytes()
+
+
+def _grid(x_bounds, top, bottom, span=False):
+    """Ruling lines for one table row; ``span`` leaves out inner vertical lines."""
+    ops = []
+    y_top = PAGE_HEIGHT - top
+    y_bottom = PAGE_HEIGHT - bottom
+    ops.append(f"{x_bounds[0]} {y_top} m {x_bounds[-1]} {y_top} l S")
+    ops.append(f"{x_bounds[0]} {y_bottom} m {x_bounds[-1]} {y_bottom} l S")
+    xs = (x_bounds[0], x_bounds[-1]) if span else x_bounds
+    for x in xs:
+        ops.append(f"{x} {y_top} m {x} {y_bottom} l S")
+    return ops
+
+
+TRANSCRIPT_COLUMNS = (40, 110, 400, 460, 520)
+
+
+def make_gpa_transcript_pdf(subjects, seed=0, rows_per_page=48, wrapped_names=False):
+    """
+    Build a GPA transcript PDF. ``subjects`` are tuples ``(code, credit, grade, term, thai_year)``;
+    long names wrap onto a continuation row and semesters may split across pages.
+    With ``wrapped_names`` a long name wraps onto a second line inside its own
+    ruled row instead, with the code, credit and grade centred beside it.
+    """
+    rng = random.Random(seed)
+    writer = _PdfWriter()
+    row_height = 14
+    x = TRANSCRIPT_COLUMNS
+
+    table_rows = [("span", "RANGSIT UNIVERSITY  OFFICIAL TRANSCRIPT"), ("span", "STUDENT ID 6603731")]
+    by_term = {}
+    for code, credit, grade, term, year in subjects:
+        if grade is None:
+            continue
+        by_term.setdefault((year, term), []).append((code, credit, grade))
+    for (year, term), rows in sorted(by_term.items()):
+        table_rows.append(("span", f"{TERM_WORDS[term]} {year - 543} / {year}"))
+        for code, credit, grade in rows:
+            name = rng.choice(COURSE_NAMES)
+            if len(name) > 40 and wrapped_names:
+                table_rows.append(("wrapped", (code, name[:40], str(credit), grade, name[40:])))
+            elif len(name) > 40:
+                table_rows.append(("cells", (code, name[:40], str(credit), grade)))
+                table_rows.append(("cells", ("", name[40:], "", "")))
+            else:
+                table_rows.append(("cells", (code, name, str(credit), grade)))
+        table_rows.append(("cells", ("Semester", "GPA 3.25", "", "")))
+        table_rows.append(("cells", ("Cumulative", "GPA 3.10", "", "")))
+    table_rows.append(("cells", ("STATUS", "NORMAL", "", "")))
+
+    for page_number, start in enumerate(range(0, len(table_rows), rows_per_page), 1):
+        # Page header and footer outside the table, like the registrar's print-out
+        ops = ["0.5 w", _text(x[0], 22, "Office of the Registrar"), _text(x[-1] - 60, 22, "UNOFFICIAL COPY")]
+        top = 40
+        for kind, value in table_rows[start:start + rows_per_page]:
+            height = row_height * 2 if kind == "wrapped" else row_height
+            ops += _grid(x, top, top + height, span=kind == "span")
+            if kind == "span":
+                ops.append(_text(x[0] + 3, top + 3, value))
+            elif kind == "wrapped":
+                for col, cell in enumerate(value[:4]):
+                    ops.append(_text(x[col] + 3, top + 3 + (0 if col == 1 else row_height / 2), cell))
+                ops.append(_text(x[1] + 3, top + 3 + row_height, value[4]))
+            else:
+                for col, cell in enumerate(value):
+                    if cell:
+                        ops.append(_text(x[col] + 3, top + 3, cell))
+            top += height
+        ops.append(_text(x[0], top + 12, f"Page {page_number}"))
+        writer.add_page(ops)
+    return writer.to_bytes()
+
+
+def make_corpus(n_students, seed=0, min_courses=30, max_courses=70):
+    """Yield ``(student_id, rsu36_bytes, transcript_bytes, courses)`` for a synthetic cohort."""
+    rng = random.Random(seed)
+    for i in range(n_students):
+        n_courses = rng.randint(min_courses, max_courses)
+        courses = random_student_courses(rng, n_courses)
+        student_id = str(6600000 + i)
+        # Retakes and ungraded courses come on top of n_courses
+        pages = rsu36_pages(len(courses))
+        yield (
+            student_id,
+            make_rsu36_pdf(courses, student_id=student_id, pages=pages, seed=seed + i),
+            make_gpa_transcript_pdf(courses, seed=seed + i),
+            courses,
+        )
@@ -0,0 +1,80 @@
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+from extract_from_gpa_file.excel_configs import excel_configs
+
+GROUP_COLORS = [
+    'FFC4B3',  # Soft Coral
+    'B8E2B8',  # Soft Green
+    'D9D9D9',  # Soft Gray
+    'A8DADC',  # Soft Cyan
+    'FFE8A1',  # Soft Yellow
+    'F5C1E0'   # Soft Pink
+]
+
+# Groups that list every allowed course, finished or not
+SHOW_ALL_ALLOWED_COURSES = ("Major Courses",)
+
+
+def _add_group_styles(wb):
+    """One named style per group color for the body, plus a bold one for the title cell."""
+    thin = Side(border_style="thin")
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    alignment = Alignment(horizontal="center", vertical="center")
+
+    styles = []
+    for i, color in enumerate(GROUP_COLORS):
+        fill = PatternFill(start_color=color, end_color=color, fill_type='solid')
+        body = NamedStyle(name=f"gpa_group_{i}", fill=fill, border=border, alignment=alignment)
+        title = NamedStyle(name=f"gpa_group_{i}_title", fill=fill, border=border, alignment=alignment, font=Font(bold=True))
+        wb.add_named_style(body)
+        wb.add_named_style(title)
+        styles.append((body.name, title.name))
+    return styles
+
+
+def write_course_groups_workbook(course_groups, output):
+    """
+    Write one colored block per CourseGroup (title, header, courses, total)
+    to `output` (a path or a writable binary file object).
+    Rows are streamed with openpyxl's write-only mode and styled through
+    shared named styles, so time and memory grow only with the row count.
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    styles = _add_group_styles(wb)
+
+    for col, config in excel_configs.items():
+        ws.column_dimensions[get_column_letter(col)].width = config["width"]
+
+    blocks = []
+    for course_group in course_groups:
+        show_all_allowed_courses = course_group.name in SHOW_ALL_ALLOWED_COURSES
+        blocks.append(course_group.convert_to_excel_format(show_all_allowed_courses))
+
+    max_column = max((len(row) for excel_data in blocks for row in excel_data), default=0)
+
+    start_row = 1
+    for i, excel_data in enumerate(blocks):
+        body_style, title_style = styles[i % len(styles)]
+
+        for r, row in enumerate(excel_data):
+            cells = []
+            for col in range(max_column):
+                cell = WriteOnlyCell(ws, value=row[col] if col < len(row) else None)
+                cell.style = title_style if r == 0 and col == 0 else body_style
+                cells.append(cell)
+            ws.append(cells)
+
+        ws.append([])
+
+        # Merge the title across the name columns and the note across the rest
+        ws.merged_cells.add(f"A{start_row}:{get_column_letter(max_column - 2)}{start_row}")
+        ws.merged_cells.add(f"G{start_row}:{get_column_letter(max_column)}{start_row}")
+
+        start_row += len(excel_data) + 1
+
+    wb.save(output)
+    return output
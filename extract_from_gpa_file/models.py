@@ -1,16 +1,17 @@
 import re
 
-class Course:
-    def __init__(self, code, credit, grade, term, year_eng, year_thai):
-        self.code = code
-        self.credit = credit
-        self.grade = grade
-        self.term = term
-        self.year_eng = year_eng
-        self.year_thai = year_thai
+from extract_from_rsu36_file.course_record import CourseRecord
 
-    def __repr__(self):
-        return f"{self.code} ({self.credit} cr) - {self.grade} [{self.term} {self.year_eng}]"
+def Course(code, credit, grade, term, year_eng, year_thai, name=None):
+    """
+    A transcript course as a CourseRecord, the same compact record as the
+    RSU36 pipeline. Keeps the original Course argument order; `term` holds
+    the semester name from the transcript (e.g. "FIRST").
+    """
+    return CourseRecord(code, credit, grade, year_eng=year_eng, year_thai=year_thai, term=term, name=name)
+
+
+COURSE_CODE_PATTERN = re.compile(r"^([A-Z]+)(\d+)$")
 
 
 class CourseGroup:
@@ -22,46 +23,78 @@ class CourseGroup:
         self.allowed_group_numbers = allowed_group_numbers or []  # e.g. [1, 2, 3]
         self.courses = []
 
-    def add_course(self, course):
-        code = course.code
-        credit = course.credit
+        self._allowed_courses = frozenset(self.allowed_courses)
+        self._allowed_prefixes = tuple(self.allowed_prefixes)
+        self._allowed_group_numbers = frozenset(self.allowed_group_numbers)
+        self._rule_cache = {}  # code -> first broken rule (None when allowed)
+        self._credits = 0
+
+    def _broken_rule(self, code):
+        """Check rules 1-3 (everything but the credit limit); cached per code."""
+        try:
+            return self._rule_cache[code]
+        except KeyError:
+            pass
+
+        broken = None
 
         # ✅ Rule 1: exact allowed courses
-        if self.allowed_courses and code not in self.allowed_courses:
-            return False, f"{code} is not an allowed course for {self.name}"
+        if self._allowed_courses and code not in self._allowed_courses:
+            broken = "not_allowed"
 
         # ✅ Rule 2: allowed prefixes
-        if self.allowed_prefixes and not any(code.startswith(p) for p in self.allowed_prefixes):
-            return False, f"{code} does not match allowed prefixes {self.allowed_prefixes} for {self.name}"
+        elif self._allowed_prefixes and not code.startswith(self._allowed_prefixes):
+            broken = "prefix"
 
         # ✅ Rule 3: allowed group numbers
-        if self.allowed_group_numbers:
-            match = re.match(r"^([A-Z]+)(\d+)$", code)
-            if match:
-                group_number = match.group(2)
-                if int(group_number[1]) not in self.allowed_group_numbers:
-                    return False, f"{code} has group number {group_number}, not allowed for {self.name}"
-            else:
-                return False, f"Cannot extract group number from {code}"
-                    
-            '''try:
-                
-                # Extract middle digit: e.g. ICT123 -> "123" -> 2
-                group_number = int(code[len(code)-3])  
-            except (IndexError, ValueError):
-                return False, f"Cannot extract group number from {code}"
+        elif self._allowed_group_numbers:
+            match = COURSE_CODE_PATTERN.match(code)
+            if not match:
+                broken = "no_group_number"
+            elif int(match.group(2)[1]) not in self._allowed_group_numbers:
+                broken = "group_number"
+
+        self._rule_cache[code] = broken
+        return broken
+
+    def _message(self, broken, code):
+        if broken == "not_allowed":
+            return f"{code} is not an allowed course for {self.name}"
+        if broken == "prefix":
+            return f"{code} does not match allowed prefixes {self.allowed_prefixes} for {self.name}"
+        if broken == "no_group_number":
+            return f"Cannot extract group number from {code}"
+        if broken == "group_number":
+            return f"{code} has group number {COURSE_CODE_PATTERN.match(code).group(2)}, not allowed for {self.name}"
+        if broken == "credit_limit":
+            return f"Adding {code} exceeds credit limit for {self.name}"
+        return f"{code} successfully added to {self.name}"
+
+    def accepts(self, code):
+        """True when the code passes the group's course rules, regardless of credits."""
+        return self._broken_rule(code) is None
+
+    def add_course(self, course, diagnostics=False):
+        """
+        Returns (success, message). The message is only built when
+        `diagnostics` is True, otherwise it is None.
+        """
+        code = course.code
+        credit = course.credit
 
-            if group_number not in self.allowed_group_numbers:
-                return False, f"{code} has group number {group_number}, not allowed for {self.name}"'''
+        broken = self._broken_rule(code)
 
         # ✅ Rule 4: credit overflow
-        if self.get_total_credits() + credit > self.total_credits:
-            return False, f"Adding {code} exceeds credit limit for {self.name}"
+        if broken is None and self._credits + credit > self.total_credits:
+            broken = "credit_limit"
+
+        if broken is not None:
+            return False, self._message(broken, code) if diagnostics else None
 
         # ✅ Passed all checks → add course
         self.courses.append(course)
-        return True, f"{code} successfully added to {self.name}"
-
+        self._credits += credit
+        return True, self._message(None, code) if diagnostics else None
 
     '''def add_course(self, code, credit, grade, term, year_eng, year_thai):
         # ✅ Rule 1: exact allowed courses
@@ -92,7 +125,7 @@ class CourseGroup:
         return True, f"{code} successfully added to {self.name}"'''
 
     def get_total_credits(self):
-        return sum(c.credit for c in self.courses)
+        return self._credits
 
     def calculate_gpa(self):
         grade_points = {
@@ -197,3 +230,45 @@ class CourseGroup:
 
     def __repr__(self):
         return f"{self.name} ({self.get_total_credits()} / {self.total_credits} credits)"
+
+
+class CourseGroupRouter:
+    """
+    Sends each course to the first group (in the given order) whose rules
+    accept it and which still has room for its credits. The groups that
+    accept a code are worked out once per code and reused.
+    """
+
+    def __init__(self, groups):
+        self.groups = list(groups)
+        self._candidates = {}  # code -> groups whose rules accept it, in order
+
+        for group in self.groups:
+            for code in group.allowed_courses:
+                self.candidates(code)
+
+    def candidates(self, code):
+        groups = self._candidates.get(code)
+        if groups is None:
+            groups = self._candidates[code] = tuple(g for g in self.groups if g.accepts(code))
+        return groups
+
+    def route(self, course, diagnostics=False):
+        """
+        Add the course to its group. Returns (group or None, messages), where
+        messages lists every group's answer in order when `diagnostics` is True.
+        """
+        if diagnostics:
+            messages = []
+            for group in self.groups:
+                success, message = group.add_course(course, diagnostics=True)
+                messages.append(message)
+                if success:
+                    return group, messages
+            return None, messages
+
+        for group in self.candidates(course.code):
+            success, _ = group.add_course(course)
+            if success:
+                return group, None
+        return None, None
@@ -1,6 +1,17 @@
+import io
+import os
 import pdfplumber
 import re
 
+from extract_from_gpa_file.transcript_layout import transcript_layout
+from extract_from_rsu36_file.page_pool import get_page_pool, picklable_input, use_page_pool
+
+# With page_workers above 1 (or GPA_PAGE_WORKERS), transcripts with at least
+# this many pages have their tables extracted on a process pool (see
+# extract_from_rsu36_file.page_pool). Off by default.
+PARALLEL_PAGE_THRESHOLD = int(os.environ.get("GPA_PARALLEL_PAGES", 4))
+PAGE_WORKERS = int(os.environ.get("GPA_PAGE_WORKERS", 0))
+
 def format_subject(subject_row, semester_name, year_eng, year_thai):
     subject_row = [x for x in subject_row if x is not None]
     return {
@@ -38,29 +49,124 @@ def is_special_row(row):
     first_cell = row[0]
     return first_cell in ("Semester", "Cumulative", "STATUS")
 
-def start_scrapping(pdf_name):
+def is_semester_row(row):
+    """Detect the row that starts a new semester table."""
+    first_cell = row[0]
+    return bool(first_cell) and ("SEMESTER" in first_cell or "SESSION" in first_cell)
+
+def _open(pdf_name):
+    return pdfplumber.open(io.BytesIO(pdf_name) if isinstance(pdf_name, (bytes, bytearray)) else pdf_name)
+
+def _table_rows(page):
+    """
+    Cleaned rows of every table on the page; the page's cached layout is released afterwards.
+    With a calibrated layout profile, pages that match the transcript's fixed
+    layout are read column by column from their characters; any other page
+    goes through extract_tables.
+    """
+    layout = transcript_layout()
+    try:
+        layout_rows = layout.extract_rows(page) if layout.calibrated else None
+        if layout_rows is None:
+            tables = page.extract_tables(layout.table_settings)
+        else:
+            tables = [layout_rows]
+    finally:
+        page.close()
+
+    rows = []
+    for table in tables:
+        for row in table:
+            row_clean = clean_row(row)
+            if row_clean:
+                rows.append(row_clean)
+    return rows
+
+def page_table_rows(pdf_name, page_number):
+    """_table_rows of one page; what the page pool's workers run."""
+    with _open(pdf_name) as pdf:
+        return _table_rows(pdf.pages[page_number])
+
+def iter_page_rows(pdf_name, page_workers=None):
+    """
+    Yield the cleaned table rows of each page, one list per page, in page order.
+    Pages are read one at a time so only one page is held in memory. With
+    page_workers above 1 (default GPA_PAGE_WORKERS), transcripts of
+    PARALLEL_PAGE_THRESHOLD pages or more have their pages' tables
+    extracted on a process pool instead, one page per task.
+    """
+    workers = PAGE_WORKERS if page_workers is None else page_workers
+    parallel = use_page_pool(workers)
+
+    with _open(pdf_name) as pdf:
+        page_count = len(pdf.pages)
+        if not parallel or page_count < PARALLEL_PAGE_THRESHOLD:
+            for page in pdf.pages:
+                yield _table_rows(page)
+            return
+
+    # Long transcript: only now is an upload copied for the workers
+    pdf_name = picklable_input(pdf_name)
+    pool = get_page_pool(workers)
+    futures = [pool.submit(page_table_rows, pdf_name, number) for number in range(page_count)]
+    for future in futures:
+        yield future.result()
+
+def iter_rows(pdf_name, page_workers=None):
+    """Yield cleaned table rows page by page."""
+    for rows in iter_page_rows(pdf_name, page_workers):
+        yield from rows
+
+def iter_subjects(pdf_name, page_workers=None):
+    """
+    Yield subject records one at a time, stitching split subject rows and
+    semester boundaries across page breaks as rows arrive.
+    Rows before the first semester (the transcript header) are skipped.
+    """
+    semester = None
+    buffer_row = []
+
+    for row in iter_rows(pdf_name, page_workers):
+        if is_semester_row(row):
+            if buffer_row:
+                yield format_subject(buffer_row, semester["semester"], semester["year_eng"], semester["year_thai"])
+                buffer_row = []
+            semester = format_semester(row)
+        elif semester is None:
+            continue
+        elif is_subject_row(row):
+            if buffer_row:
+                yield format_subject(buffer_row, semester["semester"], semester["year_eng"], semester["year_thai"])
+            buffer_row = row
+        elif is_special_row(row):
+            if buffer_row:
+                yield format_subject(buffer_row, semester["semester"], semester["year_eng"], semester["year_thai"])
+            buffer_row = []
+        elif buffer_row:
+            # continuation of previous subject
+            buffer_row += row
+
+    if buffer_row:
+        yield format_subject(buffer_row, semester["semester"], semester["year_eng"], semester["year_thai"])
+
+def merge_tables(pages):
+    """
+    Reduce the ordered per-page rows into one table per semester: tables
+    split across a page break are stitched back together and subject rows
+    split over several rows are merged, leaving special rows as they are.
+    The first table holds the rows before the first semester (the header).
+    """
     merged_tables = []
     current_table = []
 
-    with pdfplumber.open(pdf_name) as pdf:
-        pages = pdf.pages
-        for page in pages:
-            tables = page.extract_tables()
-            for table in tables:
-                for row in table:
-                    row_clean = clean_row(row)
-                    if not row_clean:
-                        continue
-
-                    first_cell = row_clean[0]
-                    is_new_semester = first_cell and ("SEMESTER" in first_cell or "SESSION" in first_cell)
-
-                    if is_new_semester:
-                        if current_table:
-                            merged_tables.append(current_table)
-                        current_table = [row_clean]  # start new table
-                    else:
-                        current_table.append(row_clean)  # continuation
+    for rows in pages:
+        for row_clean in rows:
+            if is_semester_row(row_clean):
+                if current_table:
+                    merged_tables.append(current_table)
+                current_table = [row_clean]  # start new table
+            else:
+                current_table.append(row_clean)  # continuation
 
     if current_table:
         merged_tables.append(current_table)
@@ -95,6 +201,9 @@ def start_scrapping(pdf_name):
 
     return final_tables
 
+def start_scrapping(pdf_name, page_workers=None):
+    return merge_tables(iter_page_rows(pdf_name, page_workers))
+
 def get_all_subjects(tables):
     subjects = []
     for table in tables:
@@ -0,0 +1,163 @@
+import bisect
+import json
+import os
+
+from pdfplumber.utils import extract_text
+
+# GPA_TRANSCRIPT_LAYOUT points at another profile, e.g. one measured with
+# `python -m benchmarks.gpa_layout_benchmark --calibrate transcript.pdf`
+LAYOUT_PATH = os.environ.get("GPA_TRANSCRIPT_LAYOUT") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database", "gpa_transcript_layout.json"
+)
+
+_layouts = {}  # path -> (mtime, TranscriptLayout)
+
+
+class TranscriptLayout:
+    """
+    The fixed layout of the RSU GPA transcript table (database/gpa_transcript_layout.json):
+    the x positions of its column rulings and how far apart rows are.
+    Rows are read straight from the page's characters, without pdfplumber's
+    line and intersection table finder.
+    `calibrated` is only true for a profile measured on real transcripts;
+    the scraper leaves an uncalibrated profile's fast path off.
+    """
+
+    def __init__(self, config):
+        self.calibrated = config.get("calibrated", False)
+        self.columns = tuple(config["columns"])
+        self.column_tolerance = config["column_tolerance"]
+        self.row_tolerance = config["row_tolerance"]
+        self.span_gap = config["span_gap"]
+        self.text_settings = dict(config["text_settings"])
+        self.table_settings = dict(config["table_settings"])
+
+    def _row_bands(self, page):
+        """
+        [(top, bottom)] of the table's ruled rows, from the page's horizontal
+        line and rect edges across the columns; None unless the page has a
+        vertical ruling at every column boundary.
+        """
+        tolerance = self.column_tolerance
+        verticals = [
+            edge for edge in page.vertical_edges
+            if any(abs(edge["x0"] - x) <= tolerance for x in self.columns)
+        ]
+        if not all(any(abs(edge["x0"] - x) <= tolerance for edge in verticals) for x in self.columns):
+            return None
+
+        top = min(edge["top"] for edge in verticals) - tolerance
+        bottom = max(edge["bottom"] for edge in verticals) + tolerance
+        left = self.columns[0] - tolerance
+        right = self.columns[-1] + tolerance
+
+        boundaries = []
+        for y in sorted(
+            edge["top"] for edge in page.horizontal_edges
+            if edge["x1"] > left and edge["x0"] < right and top <= edge["top"] <= bottom
+        ):
+            if not boundaries or y - boundaries[-1] > tolerance:
+                boundaries.append(y)
+        return list(zip(boundaries, boundaries[1:]))
+
+    def fits(self, page):
+        """
+        Whether the page can be read with the layout: a vertical ruling at
+        every column boundary and one line of text per cell. Wrapped cells
+        are left to extract_tables.
+        """
+        return self.extract_rows(page) is not None
+
+    def _column(self, char):
+        middle = (char["x0"] + char["x1"]) / 2
+        columns = self.columns
+        if middle < columns[0] or middle >= columns[-1]:
+            return None
+        for index in range(1, len(columns)):
+            if middle < columns[index]:
+                return index - 1
+
+    def _text_lines(self, chars):
+        rows = []
+        row_top = None
+        for char in sorted(chars, key=lambda char: (char["top"], char["x0"])):
+            if row_top is None or char["top"] - row_top > self.row_tolerance:
+                rows.append([])
+                row_top = char["top"]
+            rows[-1].append(char)
+        return rows
+
+    def _cells(self, row_chars):
+        """
+        The cell texts of one ruled row. Text that runs on across a column
+        boundary (a semester title, the transcript header) sits in one merged
+        cell, like extract_tables returns it. Characters left or right of the
+        table (page margins, stamps) are left out, as extract_tables leaves
+        them out. None when a cell holds more than one line of text.
+        """
+        columns = {}
+        previous = None
+        spans = False
+        for char in sorted(row_chars, key=lambda char: char["x0"]):
+            column = self._column(char)
+            if column is None:
+                continue
+            if previous is not None and column != previous[1] and char["x0"] - previous[0]["x1"] < self.span_gap:
+                spans = True
+            columns.setdefault(column, []).append(char)
+            previous = (char, column)
+
+        if spans:
+            columns = {0: [char for cell in columns.values() for char in cell]}
+        if any(len(self._text_lines(chars)) > 1 for chars in columns.values()):
+            return None
+        return [extract_text(columns[column], **self.text_settings) for column in sorted(columns)]
+
+    def extract_rows(self, page):
+        """
+        The table's rows as lists of cell texts (empty cells left out), one
+        per ruled row, or None when the page does not match the layout.
+        Page headers and footers outside the ruled rows are skipped.
+        """
+        bands = self._row_bands(page)
+        if bands is None:
+            return None
+
+        tops = [band_top for band_top, _ in bands]
+        band_chars = [[] for _ in bands]
+        for char in page.chars:
+            middle = (char["top"] + char["bottom"]) / 2
+            index = bisect.bisect_right(tops, middle) - 1
+            if index >= 0 and middle <= bands[index][1]:
+                band_chars[index].append(char)
+
+        rows = []
+        for row_chars in band_chars:
+            cells = self._cells(row_chars)
+            if cells is None:
+                return None
+            if cells:
+                rows.append(cells)
+        return rows
+
+
+def ruling_columns(page, tolerance=2):
+    """
+    The x positions of the page's vertical rulings, merged within
+    `tolerance`: the "columns" of a layout profile for this page.
+    """
+    columns = []
+    for x in sorted(line["x0"] for line in page.lines if abs(line["x0"] - line["x1"]) < 0.5):
+        if not columns or x - columns[-1] > tolerance:
+            columns.append(x)
+    return [round(x, 1) for x in columns]
+
+
+def transcript_layout(path=LAYOUT_PATH):
+    """The layout profile at `path`, read again when the file changes."""
+    mtime = os.stat(path).st_mtime_ns
+    entry = _layouts.get(path)
+    if entry is None or entry[0] != mtime:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = _layouts[path] = (mtime, TranscriptLayout(json.load(f)))
+    return entry[1]
@@ -0,0 +1,112 @@
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+from types import MappingProxyType
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATABASE_DIR = os.path.join(BASE_DIR, "database")
+COURSE_PLAN_FRAME_DIR = os.path.join(BASE_DIR, "course_plan_excel_frame")
+
+
+def _freeze(value):
+    """Recursively turn parsed JSON into read-only mappings and tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class ConfigRegistry:
+    """
+    Process-wide cache of the database/*.json rule files.
+    Each file is parsed once and shared read-only between threads; it is
+    re-parsed when its modification time changes (checked at most every
+    `reload_interval` seconds).
+    """
+
+    def __init__(self, database_dir=DATABASE_DIR, reload_interval=1.0):
+        self.database_dir = database_dir
+        self.reload_interval = reload_interval
+
+        self._lock = threading.Lock()
+        self._configs = {}  # name -> (mtime_ns, last_checked, frozen config)
+        self._compiled = {}  # key -> (source configs, compiled object)
+        self._version = None  # (file stamps, digest)
+
+    def get(self, name):
+        entry = self._configs.get(name)
+        now = time.monotonic()
+        if entry is not None and now - entry[1] < self.reload_interval:
+            return entry[2]
+
+        path = os.path.join(self.database_dir, f"{name}.json")
+        mtime = os.stat(path).st_mtime_ns
+
+        with self._lock:
+            entry = self._configs.get(name)
+            if entry is None or entry[0] != mtime:
+                with open(path, "r", encoding="utf-8") as f:
+                    config = _freeze(json.load(f))
+            else:
+                config = entry[2]
+            self._configs[name] = (mtime, now, config)
+
+        return config
+
+    def get_compiled(self, key, builder, *names):
+        """
+        Return builder(*configs) for the named configs, rebuilt only when one
+        of them has been reloaded.
+        """
+        configs = tuple(self.get(name) for name in names)
+
+        entry = self._compiled.get(key)
+        if entry is not None and all(a is b for a, b in zip(entry[0], configs)):
+            return entry[1]
+
+        compiled = builder(*configs)
+        with self._lock:
+            self._compiled[key] = (configs, compiled)
+
+        return compiled
+
+    def version(self):
+        """
+        Short content hash of every rule file and course plan template.
+        Changes whenever any of them is edited, so it can be part of cache keys.
+        """
+        paths = sorted(
+            glob.glob(os.path.join(self.database_dir, "*.json"))
+            + glob.glob(os.path.join(COURSE_PLAN_FRAME_DIR, "*.xlsx"))
+        )
+        stamps = tuple((path, os.stat(path).st_mtime_ns) for path in paths)
+
+        version = self._version
+        if version is not None and version[0] == stamps:
+            return version[1]
+
+        digest = hashlib.sha256()
+        for path in paths:
+            digest.update(os.path.basename(path).encode("utf-8"))
+            with open(path, "rb") as f:
+                digest.update(f.read())
+
+        self._version = (stamps, digest.hexdigest()[:16])
+        return self._version[1]
+
+    def clear(self):
+        with self._lock:
+            self._configs.clear()
+            self._compiled.clear()
+            self._version = None
+
+
+def course_plan_frame_path(faculty_name):
+    return os.path.join(COURSE_PLAN_FRAME_DIR, faculty_name + ".xlsx")
+
+
+registry = ConfigRegistry()
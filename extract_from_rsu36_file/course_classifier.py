@@ -0,0 +1,41 @@
+class CourseClassifier:
+    """
+    Compiled lookup tables for the GE and specialized major rules.
+    - GE groups are dispatched on (prefix letters, second digit of the number).
+    - Specialized groups are a direct code -> (group name, slot row) index.
+    Results for every code seen are memoized, so each course is classified once.
+    """
+
+    def __init__(self, ge_configs, specialized_configs):
+        self._ge_dispatch = {}
+        for group_name, rule in ge_configs.items():
+            for prefix in rule["prefix"]:
+                # The first matching group wins, like the rule order in the JSON
+                self._ge_dispatch.setdefault((prefix, rule["second_digit"]), group_name)
+
+        self._specialized_index = {}
+        for group_name, rule in specialized_configs.items():
+            for slot, code in enumerate(rule["courses"]):
+                self._specialized_index.setdefault(code, (group_name, rule["start_row"] + slot))
+
+        self._ge_cache = {}
+
+    def ge_group(self, course_code):
+        try:
+            return self._ge_cache[course_code]
+        except KeyError:
+            pass
+
+        prefix = "".join(c for c in course_code if c.isalpha())
+        digits = "".join(c for c in course_code if c.isdigit())
+
+        group_name = None
+        if len(digits) >= 2:
+            group_name = self._ge_dispatch.get((prefix, digits[1]))
+
+        self._ge_cache[course_code] = group_name
+        return group_name
+
+    def specialized_group(self, course_code):
+        """Return (group name, slot row) for a specialized course, or None."""
+        return self._specialized_index.get(course_code)
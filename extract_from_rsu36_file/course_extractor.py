@@ -1,51 +1,357 @@
-import pdfplumber
+import contextlib
+import io
+import mmap
+import os
 import re
-import json
+
+from extract_from_rsu36_file.config_registry import registry
+from extract_from_rsu36_file.course_line_tokenizer import tokenize_course_line
+from extract_from_rsu36_file.instrumentation import span, input_size
+from extract_from_rsu36_file.page_pool import get_page_pool, picklable_input, use_page_pool
+
+PDF_BACKENDS = ("auto", "pdfium", "pdfplumber")
+
+# With page_workers above 1 (CourseExtractor(page_workers=...), or
+# COURSE_PLAN_PAGE_WORKERS), documents with at least this many pages have
+# their pages parsed on a process pool (see page_pool). Off by default.
+PARALLEL_PAGE_THRESHOLD = int(os.environ.get("COURSE_PLAN_PARALLEL_PAGES", 8))
+PAGE_WORKERS = int(os.environ.get("COURSE_PLAN_PAGE_WORKERS", 0))
+
+# pdfminer drops or repeats some Thai vowel marks ("นามสกกล"), pdfium keeps
+# them ("นามสกุล"); accept both spellings of the labels.
+# DOTALL in case there are newlines
+STUDENT_INFO_PATTERN = re.compile(
+    r"(?:นามสกกล|นามสกุล)\s+(.*?)\s+(?:รหหสประจจาตหว|รหัสประจ(?:ำ|ํา)ตัว)\s+(\d+)",
+    re.DOTALL
+)
+
+@contextlib.contextmanager
+def _pdfplumber_input(file):
+    """
+    The input as a stream pdfminer can read without copying it: bytes are
+    wrapped in a BytesIO (which shares them until written to), a path is
+    memory-mapped, file objects are read as they are.
+    """
+    if isinstance(file, (bytes, bytearray)):
+        yield io.BytesIO(file)
+    elif isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+    else:
+        yield file
+
+
+@contextlib.contextmanager
+def _pdfium_input(file):
+    """
+    The input as pdfium takes it without copying it: bytes and paths as
+    they are (pdfium reads the file itself), and the buffer of an in-memory
+    file (BytesIO, Streamlit's UploadedFile) shared with pdfium through a
+    ctypes array instead of being read out in chunks.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        import pathlib
+        yield pathlib.Path(file)
+    elif isinstance(file, bytes):
+        yield file
+    elif hasattr(file, "getbuffer") or isinstance(file, bytearray):
+        import ctypes
+
+        view = file.getbuffer() if hasattr(file, "getbuffer") else memoryview(file)
+        array = (ctypes.c_char * len(view)).from_buffer(view)
+        try:
+            yield array
+        finally:
+            del array
+            view.release()
+    else:
+        yield file
+
+
+@contextlib.contextmanager
+def _pdfplumber_document(file):
+    """
+    Open the document through pdfminer and yield (page count, read), where
+    read(first, last) returns [(chars, width, height)] for pages first..last-1.
+    """
+    import pdfplumber  # heavy; only worker processes that parse PDFs need it
+
+    with _pdfplumber_input(file) as stream:
+        with span("extract.open", backend="pdfplumber"):
+            pdf = pdfplumber.open(stream)
+
+        def read(first, last):
+            pages = []
+            with span("extract.parse_chars", backend="pdfplumber"):
+                for page in pdf.pages[first:last]:
+                    # pdfminer layout analysis happens here, on first access
+                    chars = page.chars
+                    pages.append((chars, page.width, page.height))
+                    # Drop the page's layout and object caches; only its chars are kept
+                    page.close()
+            return pages
+
+        with pdf:
+            yield len(pdf.pages), read
+
+
+@contextlib.contextmanager
+def _pdfium_document(file):
+    """
+    Same as _pdfplumber_document, straight from pdfium: x0/x1/top/bottom/text
+    dicts with top measured from the top of the page. Characters pdfium
+    generates itself (spaces and line breaks it infers) are left out, like
+    pdfplumber does.
+    """
+    import pypdfium2 as pdfium
+    import pypdfium2.raw as pdfium_c
+
+    with _pdfium_input(file) as data:
+        with span("extract.open", backend="pdfium"):
+            pdf = pdfium.PdfDocument(data, autoclose=False)
+
+        def read(first, last):
+            pages = []
+            with span("extract.parse_chars", backend="pdfium"):
+                for index in range(len(pdf))[first:last]:
+                    page = pdf[index]
+                    textpage = page.get_textpage()
+                    try:
+                        page_width, page_height = page.get_size()
+
+                        chars = []
+                        for char_index in range(textpage.count_chars()):
+                            if pdfium_c.FPDFText_IsGenerated(textpage.raw, char_index):
+                                continue
+                            # Loose boxes span the font's ascent/descent, like pdfminer's
+                            left, bottom, right, top = textpage.get_charbox(char_index, loose=True)
+                            chars.append({
+                                "text": textpage.get_text_range(char_index, 1),
+                                "x0": left,
+                                "x1": right,
+                                "top": page_height - top,
+                                "bottom": page_height - bottom,
+                            })
+                        pages.append((chars, page_width, page_height))
+                    finally:
+                        textpage.close()
+                        page.close()
+            return pages
+
+        try:
+            yield len(pdf), read
+        finally:
+            pdf.close()
+
+
+_DOCUMENT_OPENERS = {"pdfium": _pdfium_document, "pdfplumber": _pdfplumber_document}
+
+
+def _parse_page_range(file, backend, first, last):
+    """
+    (page count, [(header lines, course lines)] for pages first..last-1).
+    Page pool entry point: each worker opens the document itself.
+    """
+    extractor = CourseExtractor()
+    with _DOCUMENT_OPENERS[backend](file) as (page_count, read_pages):
+        return page_count, extractor._page_sections(read_pages(first, last), first)
+
 
 class CourseExtractor:
-    def __init__(self):
+    def __init__(self, page_workers=None):
         self.separate_y = 90
+        # Processes to split long documents' pages across; 0 or 1 parses every page in-process
+        self.page_workers = PAGE_WORKERS if page_workers is None else page_workers
+
+    def extract_from_rsu36(self, file, backend=None):
+        """
+        Student information from the first page's header and course lines
+        from every page.
+        backend: "pdfium" reads the characters through pypdfium2, "pdfplumber"
+        through pdfminer's layout analysis, and "auto" (the default, or the
+        COURSE_PLAN_PDF_BACKEND environment variable) tries pdfium first and
+        falls back to pdfplumber when the result fails the sanity checks.
+        """
+        backend = backend or os.environ.get("COURSE_PLAN_PDF_BACKEND") or "auto"
+        if backend not in PDF_BACKENDS:
+            raise ValueError(f"Unknown PDF backend {backend!r}, expected one of {PDF_BACKENDS}")
 
-    def extract_from_rsu36(self, file):
-        pdf = pdfplumber.open(file)
-        page = pdf.pages[0]
+        with span("extract", pdf_size=input_size(file), backend=backend) as trace:
+            if backend != "auto":
+                return self._extract(file, backend, trace)
 
-        info_sec, courses_sec = self._separate_sections(page)
+            try:
+                extracted_data = self._extract(file, "pdfium", trace)
+            except Exception as e:
+                trace["fallback"] = f"{type(e).__name__}: {e}"
+            else:
+                problem = self._sanity_check(extracted_data)
+                if problem is None:
+                    return extracted_data
+                trace["fallback"] = problem
+
+            if hasattr(file, "seek"):
+                file.seek(0)
+            return self._extract(file, "pdfplumber", trace)
+
+    def _extract(self, file, backend, trace):
+        page_count, sections = self._parse_pages(file, backend, trace)
+        trace["page_count"] = page_count
+
+        info_sec = sections[0][0] if sections else []
+        courses_sec = [line for _, course_lines in sections for line in course_lines]
 
         extracted_data = {
             "information": None,
-            "courses": None
+            "courses": None,
+            "rejected_lines": None
         }
 
-        with open("database/faculty.json", "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with span("extract.config_load"):
+            faculties = registry.get("faculty")['faculties']
 
-        extracted_data['information'] = self._extract_student_info(info_sec, data['faculties'])
+        extracted_data['information'] = self._extract_student_info(info_sec, faculties)
 
-        extracted_data['courses'] = self._extract_courses(courses_sec)
+        extracted_data['courses'], extracted_data['rejected_lines'] = self._extract_courses(courses_sec)
+        trace["course_count"] = len(extracted_data['courses'])
+        if extracted_data['rejected_lines']:
+            trace["rejected_lines"] = len(extracted_data['rejected_lines'])
 
         return extracted_data
 
-    def _separate_sections(self, page):
-        page_width = page.width
-        page_height = page.height
+    def _parse_pages(self, file, backend, trace):
+        workers = self.page_workers
+        parallel = use_page_pool(workers)
+
+        with _DOCUMENT_OPENERS[backend](file) as (page_count, read_pages):
+            if not parallel or page_count < PARALLEL_PAGE_THRESHOLD:
+                return page_count, self._page_sections(read_pages(0, None), 0)
+
+        # Long document: only now is an in-memory input copied for the workers
+        file = picklable_input(file)
+        trace["page_workers"] = workers
+        chunk = -(-page_count // workers)
+        pool = get_page_pool(workers)
+        futures = [
+            pool.submit(_parse_page_range, file, backend, first, first + chunk)
+            for first in range(0, page_count, chunk)
+        ]
+        sections = []
+        for future in futures:
+            sections.extend(future.result()[1])
+        return page_count, sections
+
+    def _page_sections(self, pages, first):
+        """
+        [(header lines, course lines)] of pages numbered from `first`. The
+        header only exists on the first page; later pages are course columns
+        from top to bottom.
+        """
+        with span("extract.sections", pages=len(pages)):
+            sections = []
+            for number, (chars, page_width, page_height) in enumerate(pages, first):
+                separate_y = self.separate_y if number == 0 else None
+                sections.append(self._separate_sections(chars, page_width, page_height, separate_y))
+        return sections
 
-        # Information Section
-        top_section = page.crop((0, 0, page_width, self.separate_y))
-        information_section = top_section.extract_text().splitlines() if top_section.extract_text() else []
+    def _sanity_check(self, extracted_data):
+        """Why an extraction does not look like an RSU36 form, or None if it does."""
+        information = extracted_data["information"]
+        if not information["student_id"] or not information["name"]:
+            return "student name or id not found"
+        if information["faculty"] is None:
+            return "faculty not found"
+        if not extracted_data["courses"]:
+            return "no course lines found"
+        return None
 
-        # Courses Section (Left Half)
-        left_section = page.crop((0, self.separate_y, page_width/2, page_height))
-        text_left = left_section.extract_text().splitlines() if left_section.extract_text() else []
+    def _separate_sections(self, chars, page_width, page_height, separate_y=None):
+        """
+        Split a page's characters into header lines (above separate_y) and
+        course lines (below it, left column then right column). Without
+        separate_y the whole page is course columns.
+        """
+        mid_x = page_width / 2
 
-        # Courses Section (Right Half)
-        right_section = page.crop((page_width/2, self.separate_y, page_width, page_height))
-        text_right = right_section.extract_text().splitlines() if right_section.extract_text() else []
+        information_chars = []
+        left_chars = []
+        right_chars = []
 
-        courses_section = text_left + text_right
+        # Pull the characters once and split them into the three regions.
+        # Like page.crop, a character touching a boundary belongs to every
+        # region it overlaps.
+        for char in chars:
+            if char["x1"] < 0 or char["x0"] > page_width or char["bottom"] < 0 or char["top"] > page_height:
+                continue
+
+            # Information Section
+            if separate_y is not None and char["top"] <= separate_y:
+                information_chars.append(char)
+
+            if separate_y is None or char["bottom"] >= separate_y:
+                # Courses Section (Left Half)
+                if char["x0"] <= mid_x:
+                    left_chars.append(char)
+                # Courses Section (Right Half)
+                if char["x1"] >= mid_x:
+                    right_chars.append(char)
+
+        information_section = self._build_lines(information_chars)
+        courses_section = self._build_lines(left_chars) + self._build_lines(right_chars)
 
         return information_section, courses_section
 
+    def _build_lines(self, chars, x_tolerance=3, y_tolerance=3):
+        """
+        Rebuild text lines from characters the same way pdfplumber's
+        extract_text does: cluster by top, sort by x, split words on
+        whitespace or gaps wider than x_tolerance.
+        """
+        lines = []
+        cluster = []
+        last_top = None
+
+        for char in sorted(chars, key=lambda c: c["top"]):
+            if cluster and char["top"] > last_top + y_tolerance:
+                lines.append(self._join_line(cluster, x_tolerance, y_tolerance))
+                cluster = []
+            cluster.append(char)
+            last_top = char["top"]
+
+        if cluster:
+            lines.append(self._join_line(cluster, x_tolerance, y_tolerance))
+
+        return [line for line in lines if line]
+
+    def _join_line(self, chars, x_tolerance, y_tolerance):
+        words = []
+        word = []
+        prev = None
+
+        for char in sorted(chars, key=lambda c: (c["x0"], c["x1"])):
+            if char["text"].isspace():
+                if word:
+                    words.append("".join(word))
+                word = []
+                prev = None
+                continue
+
+            if prev is not None and (
+                char["x0"] < prev["x0"]
+                or char["x0"] > prev["x1"] + x_tolerance
+                or abs(char["top"] - prev["top"]) > y_tolerance
+            ):
+                words.append("".join(word))
+                word = []
+
+            word.append(char["text"])
+            prev = char
+
+        if word:
+            words.append("".join(word))
+
+        return " ".join(words)
+
     def _extract_student_info(self, information_section, faculties):
         information = {
             "name": None,
@@ -55,8 +361,7 @@ class CourseExtractor:
 
         combined_text = " ".join(information_section)
 
-        pattern = r"นามสกกล\s+(.*?)\s+รหหสประจจาตหว\s+(\d+)"
-        match = re.search(pattern, combined_text, re.DOTALL)  # DOTALL in case there are newlines
+        match = STUDENT_INFO_PATTERN.search(combined_text)
         if match:
             information["name"] = match.group(1).strip()
             information["student_id"] = match.group(2).strip()
@@ -65,33 +370,29 @@ class CourseExtractor:
             if faculty['id'] == 0:
                 continue
 
-            if faculty['thai_name'] in combined_text:
-                information["faculty"] = faculty
+            names = (faculty['thai_name'],) + tuple(faculty.get('thai_name_aliases', ()))
+            if any(name and name in combined_text for name in names):
+                information["faculty"] = {key: value for key, value in faculty.items() if key != 'thai_name_aliases'}
                 break
 
         return information
     
     def _extract_courses(self, courses_section):
+        """
+        CourseRecords for the course lines, and (line, reason) for lines that
+        start like a course line but could not be parsed.
+        """
         courses = []
+        rejected = []
         for raw_line in courses_section:
-            if self._is_course_format(raw_line):
-                courses.append(raw_line)
-
-        return courses
-
-    def _is_course_format(self, line):
-        parts = line.split(" ")
-        if len(parts) < 3:
-            return False
-        if not parts[0].isnumeric():
-            return False
-        if not parts[1].isalnum():
-            return False
-        if not parts[2].isdigit() or not 1 <= int(parts[2]) <= 6:
-            return False
-        
-        return True
-    
+            course, reason = tokenize_course_line(raw_line)
+            if course is not None:
+                courses.append(course)
+            elif reason != "not a course line":
+                rejected.append((raw_line, reason))
+
+        return courses, rejected
+
 '''ce = CourseExtractor()
 data = ce.extract_from_rsu36(file="6603282.pdf")
 
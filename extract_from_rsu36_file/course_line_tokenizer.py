@@ -0,0 +1,64 @@
+import functools
+import re
+
+from extract_from_rsu36_file.course_record import CourseRecord
+
+# "<row> <code> <credit> [<grade> [<term>/<thai year>] ...]", space separated.
+# A term token that is not <term>/<year> is captured as bad_term so the line
+# can be rejected with a reason instead of failing later.
+COURSE_LINE_PATTERN = re.compile(
+    r"\d+ (?P<code>[^\W_]+) (?P<credit>\d+)(?![^ ])"
+    r"(?: (?P<grade>[^ ]*)"
+    r"(?: (?:(?P<term>\d+)/(?P<year>\d+)(?![^ /])[^ ]*|(?P<bad_term>[^ ]*)))?)?"
+)
+
+TERM_LABELS = {1: "first", 2: "second", 3: "summer"}
+
+MAX_CREDIT = 6
+
+
+def thai_year_to_english(thai_year, month=1):
+    """
+    Convert Thai Buddhist Era year to Gregorian year.
+    """
+    if month <= 3:
+        return thai_year - 544
+    else:
+        return thai_year - 543
+
+
+def tokenize_course_line(line):
+    """
+    Parse one RSU36 course line in a single pass.
+    Returns (CourseRecord, None), or (None, reason) for a line that is not a
+    well-formed course line. A line with a grade but no term gets no term.
+    """
+    match = COURSE_LINE_PATTERN.match(line)
+    if match is None:
+        return None, "not a course line"
+
+    code, credit, grade, term_number, year_thai, bad_term = match.groups()
+    # A blank grade column ("1 ICT101 3 ", two spaces before the term) is no grade
+    grade = grade or None
+
+    credit = int(credit)
+    if not 1 <= credit <= MAX_CREDIT:
+        return None, f"credit {credit} out of range"
+
+    if bad_term is not None:
+        return None, f"malformed term/year {bad_term!r}"
+
+    if term_number is None:
+        return CourseRecord(code, credit, grade), None
+
+    term_number = int(term_number)
+    year_thai = int(year_thai)
+    year_eng = thai_year_to_english(year_thai)
+
+    return CourseRecord(code, credit, grade, term_number, year_eng, year_thai, _term_label(term_number, year_eng)), None
+
+
+@functools.lru_cache(maxsize=256)
+def _term_label(term_number, year_eng):
+    # A plan has a handful of distinct terms; build each label string once
+    return f"{TERM_LABELS.get(term_number, 'UNKNOWN')} / {year_eng}"
@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+
+from extract_from_rsu36_file.course_record import CourseRecord, groups_to_dicts
+
+CSV_FIELDS = ("student_id", "group_type", "group", "row") + CourseRecord._fields
+
+
+class CoursePlanResult:
+    """
+    The outcome of fitting one student's courses: the student information and
+    where every course was placed. Needs no template or openpyxl; rendering
+    it to a workbook is the optional CoursePlanFitter.generate_excel_file step.
+    """
+
+    def __init__(self, information, courses, allocation):
+        self.information = information
+        self.courses = courses
+        self.allocation = allocation
+
+    @property
+    def student_id(self):
+        return self.information["student_id"]
+
+    @property
+    def file_stem(self):
+        return f"{self.information['name']}_{self.student_id}_course_plan"
+
+    @property
+    def ge_courses(self):
+        return self.allocation.ge_courses
+
+    @property
+    def specialized_courses(self):
+        return self.allocation.specialized_courses
+
+    @property
+    def free_electives(self):
+        return self.allocation.free_electives
+
+    @property
+    def false_courses(self):
+        return self.allocation.false_courses
+
+    @property
+    def overlapped_courses(self):
+        return self.allocation.overlapped_courses
+
+    def to_dict(self):
+        return {
+            "information": self.information,
+            "ge_courses": groups_to_dicts(self.ge_courses),
+            "specialized_courses": groups_to_dicts(self.specialized_courses),
+            "free_electives": [course.to_dict() for course in self.free_electives],
+            "false_courses": [course.to_dict() for course in self.false_courses],
+            "overlapped_courses": [course.to_dict() for course in self.overlapped_courses],
+        }
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), ensure_ascii=False, default=str, **kwargs)
+
+    def csv_rows(self):
+        """One dict per filled template row, in CSV_FIELDS order."""
+        student_id = self.student_id
+        for slot in self.allocation.slots:
+            row = {"student_id": student_id, "group_type": slot.group_type, "group": slot.group, "row": slot.row}
+            row.update(slot.course.to_dict())
+            yield row
+
+    def to_csv(self, file=None):
+        """Write the CSV to `file` (a text file object), or return it as a string."""
+        out = file if file is not None else io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(self.csv_rows())
+        if file is None:
+            return out.getvalue()
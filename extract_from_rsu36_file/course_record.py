@@ -0,0 +1,41 @@
+from typing import NamedTuple, Optional, Union
+
+
+class CourseRecord(NamedTuple):
+    """
+    One course attempt, shared by the RSU36 and GPA transcript pipelines.
+    A named tuple: no per-instance __dict__, immutable, hashable and directly
+    usable in sets, dict keys and sorts.
+    """
+
+    code: str
+    credit: int
+    grade: Optional[str] = None
+    term_number: Optional[int] = None
+    year_eng: Optional[Union[int, str]] = None
+    year_thai: Optional[Union[int, str]] = None
+    term: Optional[str] = None
+    name: Optional[str] = None
+
+    @property
+    def key(self):
+        """Stable identity of the attempt: the same course in the same term."""
+        return (self.code, self.term_number, self.year_thai)
+
+    @property
+    def sort_key(self):
+        """Chronological order; courses without a year or term go last."""
+        return (
+            self.year_eng is None,   # False (0) first, True (1) last
+            self.year_eng if self.year_eng is not None else float("inf"),
+            self.term_number is None,       # False (0) first, True (1) last
+            self.term_number if self.term_number is not None else float("inf")
+        )
+
+    def to_dict(self):
+        return self._asdict()
+
+
+def groups_to_dicts(groups):
+    """{group name: [CourseRecord]} -> {group name: [dict]} for JSON output."""
+    return {name: [course.to_dict() for course in courses] for name, courses in groups.items()}
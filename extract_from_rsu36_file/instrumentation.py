@@ -0,0 +1,184 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("course_plan.trace")
+
+# Upper bounds (ms) of the histogram buckets; the last bucket catches everything slower
+BUCKET_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+_enabled = False
+
+
+def enable(enabled=True):
+    """
+    Turn span recording on or off. Spans are emitted as one JSON object per
+    line on the "course_plan.trace" logger and aggregated in `histogram`.
+    """
+    global _enabled
+    _enabled = enabled
+
+    if enabled and not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+def is_enabled():
+    return _enabled
+
+
+class SpanHistogram:
+    """Thread-safe per-span duration histogram."""
+
+    def __init__(self, bounds=BUCKET_BOUNDS_MS):
+        self.bounds = bounds
+        self._lock = threading.Lock()
+        self._spans = {}
+
+    def record(self, name, duration_ms):
+        index = len(self.bounds)
+        for i, bound in enumerate(self.bounds):
+            if duration_ms <= bound:
+                index = i
+                break
+
+        with self._lock:
+            stats = self._spans.get(name)
+            if stats is None:
+                stats = self._spans[name] = {
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "min_ms": duration_ms,
+                    "max_ms": duration_ms,
+                    "buckets": [0] * (len(self.bounds) + 1),
+                }
+            stats["count"] += 1
+            stats["total_ms"] += duration_ms
+            stats["min_ms"] = min(stats["min_ms"], duration_ms)
+            stats["max_ms"] = max(stats["max_ms"], duration_ms)
+            stats["buckets"][index] += 1
+
+    def _percentile(self, stats, pct):
+        # Upper bound of the bucket holding the percentile, capped by the real max
+        target = stats["count"] * pct / 100
+        seen = 0
+        for i, count in enumerate(stats["buckets"]):
+            seen += count
+            if seen >= target:
+                bound = self.bounds[i] if i < len(self.bounds) else stats["max_ms"]
+                return min(bound, stats["max_ms"])
+        return stats["max_ms"]
+
+    def snapshot(self):
+        with self._lock:
+            spans = {name: dict(stats, buckets=list(stats["buckets"])) for name, stats in self._spans.items()}
+
+        summary = {}
+        for name, stats in sorted(spans.items()):
+            summary[name] = {
+                "count": stats["count"],
+                "mean_ms": stats["total_ms"] / stats["count"],
+                "min_ms": stats["min_ms"],
+                "p50_ms": self._percentile(stats, 50),
+                "p90_ms": self._percentile(stats, 90),
+                "p99_ms": self._percentile(stats, 99),
+                "max_ms": stats["max_ms"],
+                "buckets": dict(zip([f"<={b}ms" for b in self.bounds] + ["slower"], stats["buckets"])),
+            }
+        return summary
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+
+
+histogram = SpanHistogram()
+
+# Lists that also receive (name, duration_ms) of every span, see collect_spans
+_collectors = []
+
+
+@contextmanager
+def collect_spans():
+    """
+    Yield a list that gets (name, duration_ms) of every span recorded while
+    the block runs, e.g. to ship a worker process's timings back with its result.
+    """
+    spans = []
+    _collectors.append(spans)
+    try:
+        yield spans
+    finally:
+        _collectors.remove(spans)
+
+
+def merge_spans(spans):
+    """Record timings returned by collect_spans (in another process) in `histogram`."""
+    for name, duration_ms in spans:
+        histogram.record(name, duration_ms)
+
+
+@contextmanager
+def span(name, **attributes):
+    """
+    Time a block of work. The yielded dict can be filled with more attributes
+    (course count, page count, ...) while the block runs.
+    Does nothing but yield when tracing is disabled.
+    """
+    if not _enabled:
+        yield attributes
+        return
+
+    started = time.perf_counter()
+    error = None
+    try:
+        yield attributes
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        duration_ms = (time.perf_counter() - started) * 1000
+        histogram.record(name, duration_ms)
+        for spans in _collectors:
+            spans.append((name, duration_ms))
+
+        record = {"span": name, "duration_ms": round(duration_ms, 3), "pid": os.getpid(), "thread": threading.current_thread().name}
+        record.update(attributes)
+        if error is not None:
+            record["error"] = error
+        logger.info(json.dumps(record, ensure_ascii=False, default=str))
+
+
+def input_size(file):
+    """Best-effort byte size of a path, in-memory PDF, Streamlit UploadedFile or file object."""
+    if isinstance(file, (bytes, bytearray)):
+        return len(file)
+
+    if isinstance(file, (str, os.PathLike)):
+        try:
+            return os.path.getsize(file)
+        except OSError:
+            return None
+
+    size = getattr(file, "size", None)
+    if isinstance(size, int):
+        return size
+
+    try:
+        position = file.tell()
+        file.seek(0, os.SEEK_END)
+        size = file.tell()
+        file.seek(position)
+        return size
+    except (AttributeError, OSError):
+        return None
+
+
+if os.environ.get("COURSE_PLAN_TRACE", "") not in ("", "0"):
+    enable()
@@ -0,0 +1,175 @@
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as JobTimeoutError
+
+from extract_from_rsu36_file import instrumentation
+from extract_from_rsu36_file.pipeline import fit_file, run_pipeline
+from extract_from_rsu36_file.warmup import warm_up
+
+
+class QueueFullError(Exception):
+    def __init__(self, retry_after):
+        super().__init__(f"Extraction queue is full, retry in {retry_after} seconds")
+        self.retry_after = retry_after
+
+
+def extract_job(file_bytes):
+    """Process pool entry point: returns plain, picklable results."""
+    # The bytes go in as they are: the PDF parsers read them without a copy
+    excel_file, information, ge_courses, specialized_courses = run_pipeline(file_bytes)
+    return excel_file.getvalue(), information, ge_courses, specialized_courses
+
+
+def _ready():
+    return os.getpid()
+
+
+def plan_result_job(file_bytes):
+    """Process pool entry point that skips the workbook: returns a CoursePlanResult."""
+    return fit_file(file_bytes).result()
+
+
+def _traced_job(fn, file_bytes, trace):
+    """
+    Run a job in a worker and return (result, span timings). The spans land in
+    the worker's own histogram, so they travel back for the parent to merge.
+    """
+    if trace:
+        instrumentation.enable()
+    with instrumentation.collect_spans() as spans:
+        result = fn(file_bytes)
+    return result, spans
+
+
+class JobQueue:
+    """
+    Bounded process pool for extraction jobs.
+    - At most `max_in_flight` jobs run at once (one per worker process).
+    - At most `max_queue` more wait for a worker; further submissions are
+      rejected with QueueFullError instead of piling up.
+    - Finished jobs are kept for `result_ttl` seconds for the caller to collect.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, max_in_flight=None, max_queue=32, result_ttl=600, retry_after=5):
+        self.max_in_flight = max_in_flight or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.result_ttl = result_ttl
+        self.retry_after = retry_after
+
+        # spawn: forking a multi-threaded server process is not safe.
+        # Every worker warms up (imports, configs, parser) before its first job.
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_in_flight,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=warm_up
+        )
+        # Re-entrant: a done callback may fire inside submit() while the lock is held
+        self._lock = threading.RLock()
+        self._jobs = {}  # job id -> [future, finished_at]
+
+    def submit(self, file_bytes, fn=extract_job):
+        with self._lock:
+            self._expire()
+
+            pending = sum(1 for future, _ in self._jobs.values() if not future.done())
+            if pending >= self.max_in_flight + self.max_queue:
+                raise QueueFullError(self.retry_after)
+
+            job_id = uuid.uuid4().hex
+            future = self._executor.submit(_traced_job, fn, file_bytes, instrumentation.is_enabled())
+            self._jobs[job_id] = [future, None]
+            future.add_done_callback(lambda _, job_id=job_id: self._mark_finished(job_id))
+
+        return job_id
+
+    def start_workers(self):
+        """
+        Start every worker process now instead of on the first jobs; each one
+        warms up as it starts. Returns the futures of the no-op start-up tasks.
+        """
+        return [self._executor.submit(_ready) for _ in range(self.max_in_flight)]
+
+    def status(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+
+        future = job[0]
+        if not future.done():
+            return self.RUNNING if future.running() else self.QUEUED
+        if future.exception() is not None:
+            return self.FAILED
+        return self.DONE
+
+    def pop_result(self, job_id):
+        """
+        Return the job's result (re-raising its exception) and forget the job.
+        The job's span timings are merged into this process's histogram.
+        """
+        with self._lock:
+            future, _ = self._jobs.pop(job_id)
+        result, spans = future.result()
+        instrumentation.merge_spans(spans)
+        return result
+
+    def wait(self, job_id, timeout=None):
+        """
+        Block until the job finishes and return its result like pop_result.
+        On timeout JobTimeoutError is raised and the job is forgotten: at once
+        if it had not started yet (it is cancelled), otherwise once it
+        finishes, so it keeps counting against the queue while it runs.
+        """
+        future = self._jobs[job_id][0]
+        try:
+            future.result(timeout=timeout)
+        except JobTimeoutError:
+            if future.cancel():
+                self._forget(job_id)
+            else:
+                future.add_done_callback(lambda _, job_id=job_id: self._forget(job_id))
+            raise
+        except Exception:
+            pass
+
+        return self.pop_result(job_id)
+
+    def stats(self):
+        with self._lock:
+            running = sum(1 for future, _ in self._jobs.values() if future.running())
+            pending = sum(1 for future, _ in self._jobs.values() if not future.done())
+        return {
+            "running": running,
+            "queued": pending - running,
+            "capacity": self.max_in_flight + self.max_queue,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _mark_finished(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job[1] = time.monotonic()
+
+    def _forget(self, job_id):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def _expire(self):
+        # Drop results nobody came back for (e.g. the user closed the tab)
+        now = time.monotonic()
+        expired = [
+            job_id for job_id, (_, finished_at) in self._jobs.items()
+            if finished_at is not None and now - finished_at > self.result_ttl
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
@@ -0,0 +1,39 @@
+import multiprocessing
+import os
+
+_pools = {}  # worker count -> ProcessPoolExecutor, shared by the RSU36 and GPA readers
+
+
+def get_page_pool(workers):
+    """
+    The process pool that splits documents' pages across `workers`
+    processes, created on first use. Its processes are spawned (the caller
+    may be a multi-threaded server process), so scripts that turn page
+    workers on need an `if __name__ == "__main__":` guard.
+    """
+    pool = _pools.get(workers)
+    if pool is None:
+        from concurrent.futures import ProcessPoolExecutor
+
+        pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return pool
+
+
+def use_page_pool(workers):
+    """
+    Whether to parse pages on a pool of `workers` processes: more than one,
+    and not from inside a worker process (JobQueue, batch or page pool
+    workers already run one document each; a pool of their own would only
+    oversubscribe the CPUs).
+    """
+    return workers > 1 and multiprocessing.parent_process() is None
+
+
+def picklable_input(file):
+    """The input as page pool workers can open it: a path or the PDF's bytes."""
+    if isinstance(file, (str, bytes, bytearray, os.PathLike)):
+        return file
+    if hasattr(file, "getvalue"):
+        return file.getvalue()
+    file.seek(0)
+    return file.read()
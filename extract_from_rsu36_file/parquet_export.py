@@ -0,0 +1,149 @@
+import os
+import uuid
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# One row per course attempt of one student, for either pipeline
+COURSE_RECORD_SCHEMA = pa.schema([
+    ("source", pa.string()),        # "rsu36" or "transcript"
+    ("student_id", pa.string()),
+    ("faculty", pa.string()),
+    ("code", pa.string()),
+    ("name", pa.string()),
+    ("credit", pa.int16()),
+    ("grade", pa.string()),
+    ("term", pa.string()),
+    ("term_number", pa.int8()),
+    ("year_eng", pa.int16()),
+    ("year_thai", pa.int16()),
+    ("group", pa.string()),         # GE / specialized / transcript group name
+    ("group_type", pa.string()),    # RSU36: "ge", "specialized", "free_elective", "false_course", "overlapped"
+    ("slot_status", pa.string()),   # "placed", "free_elective", "false_course", "overlapped", ...
+    ("row", pa.int16()),            # template row, RSU36 plans only
+])
+
+DEFAULT_PARTITION_COLS = ("source", "faculty")
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _record(source, student_id, faculty, course, group, group_type, slot_status, row=None):
+    return {
+        "source": source,
+        "student_id": student_id,
+        "faculty": faculty,
+        "code": course.code,
+        "name": course.name,
+        "credit": course.credit,
+        "grade": course.grade,
+        "term": course.term,
+        "term_number": course.term_number,
+        "year_eng": _to_int(course.year_eng),
+        "year_thai": _to_int(course.year_thai),
+        "group": group,
+        "group_type": group_type,
+        "slot_status": slot_status,
+        "row": row,
+    }
+
+
+def plan_records(fitter, allocation=None):
+    """
+    Rows for every course of a fitted CoursePlanFitter: where it was placed
+    (GE or specialized group, free elective, false course, repeated) and
+    courses the plan does not show at all ("not_shown").
+    """
+    if allocation is None:
+        allocation = fitter.allocate()
+
+    student_id = fitter.student_id
+    faculty = fitter.faculty_name
+
+    records = []
+    shown = set()
+    for slot in allocation.slots:
+        status = "placed" if slot.group_type in ("ge", "specialized") else slot.group_type
+        shown.add(slot.course)
+        records.append(_record("rsu36", student_id, faculty, slot.course, slot.group, slot.group_type, status, slot.row))
+
+    for course in fitter.courses:
+        if course not in shown:
+            shown.add(course)
+            records.append(_record("rsu36", student_id, faculty, course, None, None, "not_shown"))
+
+    return records
+
+
+def transcript_records(subjects, student_id=None, faculty=None, router=None):
+    """
+    Rows for the subject dicts of get_all_subjects / iter_subjects. With a
+    CourseGroupRouter the assigned group is recorded too ("unassigned" when
+    no group had room).
+    """
+    from extract_from_gpa_file.models import Course
+
+    records = []
+    for subject in subjects:
+        course = Course(
+            code=subject["code"],
+            credit=subject["credit"],
+            grade=subject["grade"],
+            term=subject["semester"],
+            year_eng=subject["year_eng"],
+            year_thai=subject["year_thai"],
+            name=subject["name"]
+        )
+
+        group_name = slot_status = None
+        if router is not None:
+            group, _ = router.route(course)
+            if group is not None:
+                group_name, slot_status = group.name, "placed"
+            else:
+                slot_status = "unassigned"
+
+        records.append(_record("transcript", student_id, faculty, course, group_name, None, slot_status))
+
+    return records
+
+
+class ParquetDatasetWriter:
+    """
+    Appends course records to a Hive-partitioned Parquet dataset
+    (`root/source=.../faculty=.../part-*.parquet`). Every write() adds new
+    files next to the existing ones, so batches can be appended from many
+    runs and the whole dataset read back with `read_dataset`.
+    """
+
+    def __init__(self, root, partition_cols=DEFAULT_PARTITION_COLS, schema=COURSE_RECORD_SCHEMA):
+        self.root = root
+        self.partition_cols = list(partition_cols)
+        self.schema = schema
+        os.makedirs(root, exist_ok=True)
+
+    def write(self, records):
+        if not records:
+            return 0
+
+        table = pa.Table.from_pylist(records, schema=self.schema)
+        pq.write_to_dataset(
+            table,
+            root_path=self.root,
+            partition_cols=self.partition_cols,
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        return table.num_rows
+
+
+def read_dataset(root, partition_cols=DEFAULT_PARTITION_COLS):
+    """Open a dataset written by ParquetDatasetWriter for filtering / to_table()."""
+    partition_schema = pa.schema([COURSE_RECORD_SCHEMA.field(name) for name in partition_cols])
+    return ds.dataset(root, format="parquet", partitioning=ds.partitioning(partition_schema, flavor="hive"))
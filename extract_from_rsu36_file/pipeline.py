@@ -0,0 +1,72 @@
+import io
+import os
+
+from extract_from_rsu36_file.course_extractor import CourseExtractor
+from extract_from_rsu36_file.course_plan_fitter import CoursePlanFitter
+
+
+def fit_file(file):
+    """Extract and fit one RSU36 file; returns the fitted CoursePlanFitter."""
+    extractor = CourseExtractor()
+    data = extractor.extract_from_rsu36(file=file)
+
+    fitter = CoursePlanFitter()
+    fitter.fit(data)
+    return fitter
+
+
+def save_result(result, output_dir, output_format):
+    """Write a CoursePlanResult as <name>_<id>_course_plan.json or .csv; returns the path."""
+    file_path = os.path.join(output_dir, f"{result.file_stem}.{output_format}")
+    with open(file_path, "w", encoding="utf-8", newline="") as f:
+        if output_format == "json":
+            f.write(result.to_json(indent=2))
+        else:
+            result.to_csv(f)
+    return file_path
+
+
+def save_snapshot_workbook(fitter, snapshot_dir, output_dir=None, result=None):
+    """
+    Render the plan by patching the student's previous workbook in snapshot_dir
+    (see plan_snapshots.update_plan). Returns the saved path when output_dir is
+    given, otherwise the same tuple as CoursePlanFitter.generate_excel_file(is_web=True).
+    """
+    from extract_from_rsu36_file.plan_snapshots import PlanSnapshotStore, update_plan
+
+    data, result, _ = update_plan(fitter, PlanSnapshotStore(snapshot_dir), result)
+
+    if output_dir is None:
+        return io.BytesIO(data), result.information, result.ge_courses, result.specialized_courses
+
+    file_path = os.path.join(output_dir, f"{result.file_stem}.xlsx")
+    with open(file_path, "wb") as f:
+        f.write(data)
+    return file_path
+
+
+def run_pipeline(file, output_dir=None, output_format="xlsx", snapshot_dir=None):
+    """
+    Extract, fit and render one RSU36 file.
+    output_format "xlsx": returns the saved workbook path when output_dir is
+    given, otherwise the same tuple as CoursePlanFitter.generate_excel_file(is_web=True).
+    With snapshot_dir, the workbook is the student's previous plan with only
+    the changed cells rewritten.
+    output_format "json" / "csv": no workbook is rendered; returns the saved
+    file path when output_dir is given, otherwise the CoursePlanResult.
+    """
+    fitter = fit_file(file)
+
+    if output_format in ("json", "csv"):
+        result = fitter.result()
+        if output_dir is None:
+            return result
+        return save_result(result, output_dir, output_format)
+
+    if snapshot_dir is not None:
+        return save_snapshot_workbook(fitter, snapshot_dir, output_dir)
+
+    if output_dir is not None:
+        return fitter.generate_excel_file(output_dir=output_dir)
+
+    return fitter.generate_excel_file(is_web=True)
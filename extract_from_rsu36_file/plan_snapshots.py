@@ -0,0 +1,191 @@
+import json
+import os
+import tempfile
+
+from extract_from_rsu36_file.config_registry import registry
+from extract_from_rsu36_file.course_record import CourseRecord
+from extract_from_rsu36_file.instrumentation import span
+from extract_from_rsu36_file.slot_allocator import Slot
+from extract_from_rsu36_file.xlsx_patcher import CompiledTemplate
+
+
+class PlanDiff:
+    """
+    What changed between two uploads of the same student's RSU36, matched on
+    CourseRecord.key (course, term and year):
+    - added: attempts that were not there before
+    - regraded: (old, new) pairs of the same attempt with a new grade or credit
+    - removed: attempts that are no longer there
+    affected_groups: the (group type, group) of every template section whose
+    rows changed, filled in once the new plan is allocated.
+    """
+
+    def __init__(self, added, regraded, removed):
+        self.added = added
+        self.regraded = regraded
+        self.removed = removed
+        self.affected_groups = []
+
+    @classmethod
+    def compute(cls, old_courses, new_courses):
+        old_by_key = {course.key: course for course in old_courses}
+        new_by_key = {course.key: course for course in new_courses}
+
+        added = [course for key, course in new_by_key.items() if key not in old_by_key]
+        removed = [course for key, course in old_by_key.items() if key not in new_by_key]
+        regraded = [
+            (old_by_key[key], course) for key, course in new_by_key.items()
+            if key in old_by_key and old_by_key[key] != course
+        ]
+        return cls(added, regraded, removed)
+
+    def is_empty(self):
+        return not (self.added or self.regraded or self.removed)
+
+    def to_dict(self):
+        return {
+            "added": [course.to_dict() for course in self.added],
+            "regraded": [{"old": old.to_dict(), "new": new.to_dict()} for old, new in self.regraded],
+            "removed": [course.to_dict() for course in self.removed],
+            "affected_groups": [list(group) for group in self.affected_groups],
+        }
+
+
+class PlanSnapshot:
+    """
+    The courses and filled template rows of the last plan generated for a
+    student, plus the rule config version it was generated with.
+    """
+
+    def __init__(self, student_id, faculty, version, courses, slots):
+        self.student_id = student_id
+        self.faculty = faculty
+        self.version = version
+        self.courses = courses
+        self.slots = slots
+
+    @classmethod
+    def from_result(cls, result, version):
+        return cls(result.student_id, result.information["faculty"]["name"], version, list(result.courses), list(result.allocation.slots))
+
+    @property
+    def placements(self):
+        """(row, CourseRecord) in write order, like Allocation.placements."""
+        return [(slot.row, slot.course) for slot in self.slots]
+
+    def to_dict(self):
+        return {
+            "student_id": self.student_id,
+            "faculty": self.faculty,
+            "version": self.version,
+            "courses": [course.to_dict() for course in self.courses],
+            "slots": [[slot.row, slot.group_type, slot.group, slot.course.to_dict()] for slot in self.slots],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data["student_id"],
+            data["faculty"],
+            data["version"],
+            [CourseRecord(**course) for course in data["courses"]],
+            [Slot(row, CourseRecord(**course), group_type, group) for row, group_type, group, course in data["slots"]],
+        )
+
+
+class PlanSnapshotStore:
+    """
+    One snapshot per student in `root`: <student_id>.json and the workbook
+    generated from it, <student_id>.xlsx. Both are replaced atomically.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, student_id, extension):
+        if student_id is None:
+            # Every upload without an id would share one "None" snapshot
+            raise ValueError("A plan snapshot needs a student id")
+        return os.path.join(self.root, f"{student_id}.{extension}")
+
+    def load(self, student_id):
+        """(PlanSnapshot, workbook bytes), or None if there is no usable snapshot."""
+        try:
+            with open(self._path(student_id, "json"), "r", encoding="utf-8") as f:
+                snapshot = PlanSnapshot.from_dict(json.load(f))
+            with open(self._path(student_id, "xlsx"), "rb") as f:
+                workbook = f.read()
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return snapshot, workbook
+
+    def save(self, snapshot, workbook):
+        # The workbook first: a snapshot never points at an older workbook
+        self._replace(self._path(snapshot.student_id, "xlsx"), workbook)
+        self._replace(self._path(snapshot.student_id, "json"), json.dumps(snapshot.to_dict(), ensure_ascii=False).encode("utf-8"))
+
+    @staticmethod
+    def _replace(path, data):
+        # A unique temp file per write: threads of one process may save the same student
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+def _affected_groups(old_slots, new_slots):
+    changed = set(old_slots) ^ set(new_slots)
+    return sorted({(slot.group_type, slot.group or "") for slot in changed})
+
+
+def update_plan(fitter, store, result=None):
+    """
+    Render the fitter's plan by patching the student's previous workbook.
+    The plan is allocated again (one pass over the courses, since GE overflow
+    feeds the free elective rows), and only the cells whose value differs
+    from the stored snapshot are rewritten; every other part of the previous
+    workbook is copied as is. Without a snapshot for the same faculty and
+    rule config version, the template is filled from scratch.
+    Returns (workbook bytes, CoursePlanResult, PlanDiff or None when the
+    plan was rendered from scratch) and stores the new snapshot.
+    """
+    with span("snapshot.update", student_id=fitter.student_id) as trace:
+        if result is None:
+            result = fitter.result()
+
+        snapshot = PlanSnapshot.from_result(result, registry.version())
+        previous = store.load(fitter.student_id)
+
+        if previous is None or (previous[0].faculty, previous[0].version) != (snapshot.faculty, snapshot.version):
+            trace["mode"] = "full"
+            template = fitter._get_compiled_template()
+            if template is None:
+                raise FileNotFoundError(f"No course plan template for {fitter.faculty_name}")
+            diff = None
+            data = template.render(fitter.plan_cells(result.allocation))
+        else:
+            old_snapshot, workbook = previous
+            diff = PlanDiff.compute(old_snapshot.courses, snapshot.courses)
+            diff.affected_groups = _affected_groups(old_snapshot.slots, snapshot.slots)
+
+            old_cells = fitter.plan_cells(old_snapshot)
+            new_cells = fitter.plan_cells(result.allocation)
+            changed = {
+                cell: new_cells.get(cell) for cell in old_cells.keys() | new_cells.keys()
+                if old_cells.get(cell) != new_cells.get(cell)
+            }
+            trace["mode"] = "patch"
+            trace["changed_cells"] = len(changed)
+
+            data = CompiledTemplate(workbook).render(changed) if changed else workbook
+
+        store.save(snapshot, data)
+        return data, result, diff
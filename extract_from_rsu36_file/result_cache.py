@@ -0,0 +1,140 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from extract_from_rsu36_file.config_registry import registry
+
+
+class ResultCache:
+    """
+    Two-tier cache for extraction results, keyed by the SHA-256 of the uploaded
+    PDF plus the rule config version.
+    - Memory: LRU of the last `max_entries` results.
+    - Disk (optional, when `disk_dir` is set): one pickle file per key, evicted
+      after `disk_ttl` seconds or when the directory grows past `disk_max_bytes`.
+    """
+
+    def __init__(self, max_entries=128, disk_dir=None, disk_max_bytes=512 * 1024 * 1024, disk_ttl=7 * 24 * 3600):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self.disk_ttl = disk_ttl
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+
+        if self.disk_dir is not None:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    def make_key(self, file_bytes):
+        return f"{hashlib.sha256(file_bytes).hexdigest()}-{registry.version()}"
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+        value = self._read_disk(key)
+        if value is not None:
+            self._put_memory(key, value)
+
+        return value
+
+    def put(self, key, value):
+        self._put_memory(key, value)
+        self._write_disk(key, value)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+
+        if self.disk_dir is not None:
+            for path, _, _ in self._disk_entries():
+                self._remove(path)
+
+    def _put_memory(self, key, value):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.pkl")
+
+    def _read_disk(self, key):
+        if self.disk_dir is None:
+            return None
+
+        path = self._disk_path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.disk_ttl:
+                self._remove(path)
+                return None
+
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+
+            # Touch the file so size eviction drops the least recently used entries first
+            os.utime(path)
+            return value
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def _write_disk(self, key, value):
+        if self.disk_dir is None:
+            return
+
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError:
+            self._remove(tmp_path)
+            return
+
+        self._evict_disk()
+
+    def _disk_entries(self):
+        entries = []
+        for name in os.listdir(self.disk_dir):
+            if not name.endswith(".pkl"):
+                continue
+            path = os.path.join(self.disk_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def _evict_disk(self):
+        now = time.time()
+        entries = []
+        total_size = 0
+        for path, mtime, size in self._disk_entries():
+            if now - mtime > self.disk_ttl:
+                self._remove(path)
+                continue
+            entries.append((mtime, size, path))
+            total_size += size
+
+        # Oldest first
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.disk_max_bytes:
+                break
+            self._remove(path)
+            total_size -= size
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,188 @@
+from typing import NamedTuple, Optional
+
+from extract_from_rsu36_file.course_record import CourseRecord
+
+GROUP_3_TO_8_TITLES = (
+    "Leadership and Social Responsibility",
+    "Arts and Culture",
+    "Innovative Entrepreneurship",
+    "Digital Media Literacy",
+    "Essence of Science",
+    "RSU My-Style"
+)
+
+# At most this many of the GE groups 3-8 count; later GE courses become free electives
+MAX_GE_3_TO_8_GROUPS = 5
+
+
+class Slot(NamedTuple):
+    """One filled template row."""
+
+    row: int
+    course: CourseRecord
+    group_type: str              # "ge", "specialized", "free_elective", "false_course" or "overlapped"
+    group: Optional[str] = None  # GE / specialized group name
+
+
+class Allocation:
+    """Where every course of a plan ended up, and the template row it fills."""
+
+    def __init__(self):
+        self.ge_courses = {}           # group name -> [CourseRecord]
+        self.specialized_courses = {}  # group name -> [CourseRecord]
+        self.free_electives = []
+        self.false_courses = []
+        self.overlapped_courses = []
+        self.slots = []                # Slot in write order
+
+    @property
+    def placements(self):
+        """(row, CourseRecord) in write order."""
+        return [(slot.row, slot.course) for slot in self.slots]
+
+
+class _Section:
+    """Running credit total and next free row of one template section."""
+
+    def __init__(self, config):
+        self.start_row = config["start_row"]
+        self.end_row = config.get("end_row")
+        self.max_credit = config.get("max_credit")
+        self.courses = []
+        self.members = set()
+        self.credits = 0
+
+    @property
+    def next_row(self):
+        return self.start_row + len(self.courses)
+
+    def is_full(self):
+        return self.max_credit is not None and self.credits >= self.max_credit
+
+    def has_free_row(self):
+        return self.end_row is None or self.next_row <= self.end_row
+
+    def add(self, course):
+        self.courses.append(course)
+        self.members.add(course)
+        self.credits += course.credit
+
+
+class SlotAllocator:
+    """
+    Assigns every course to a GE, specialized, free elective or false course
+    row in a single pass over the chronologically sorted courses, keeping
+    running credit counters and row cursors per section.
+    """
+
+    def __init__(self, classifier, ge_configs, specialized_configs, free_and_false_configs):
+        self.classifier = classifier
+        self.ge_configs = ge_configs
+        self.specialized_configs = specialized_configs
+        self.free_and_false_configs = free_and_false_configs
+
+    def allocate(self, courses):
+        allocation = Allocation()
+
+        ge_sections = {}
+        specialized_sections = {}
+        ge_3_to_8_seen = set()
+
+        free_section = _Section(self.free_and_false_configs["Free Electives"])
+        false_section = _Section(self.free_and_false_configs["False Courses"])
+
+        # Candidates for free elective rows are collected per term, so that within
+        # a term GE overflow comes first, then specialized overflow, then courses
+        # outside both (the order the template has always been filled in).
+        term_key = None
+        ge_overflow, specialized_overflow, unclassified = [], [], []
+        unclassified_seen = set()
+        ge_overlapped, specialized_overlapped = [], []
+
+        def flush_free_candidates():
+            for course in ge_overflow + specialized_overflow + unclassified:
+                if not free_section.is_full() and free_section.has_free_row():
+                    allocation.slots.append(Slot(free_section.next_row, course, "free_elective"))
+                    free_section.add(course)
+                    allocation.free_electives.append(course)
+                else:
+                    allocation.slots.append(Slot(false_section.next_row, course, "false_course"))
+                    false_section.add(course)
+                    allocation.false_courses.append(course)
+            ge_overflow.clear()
+            specialized_overflow.clear()
+            unclassified.clear()
+
+        for course in courses:
+            if course.sort_key != term_key:
+                flush_free_candidates()
+                term_key = course.sort_key
+
+            ### GE Courses ###
+            group_name = self.classifier.ge_group(course.code)
+            if group_name is not None:
+                if len(ge_3_to_8_seen) >= MAX_GE_3_TO_8_GROUPS:
+                    ge_overflow.append(course)
+                    continue
+
+                if group_name in GROUP_3_TO_8_TITLES:
+                    ge_3_to_8_seen.add(group_name)
+
+                section = ge_sections.get(group_name)
+                if section is None:
+                    section = ge_sections[group_name] = _Section(self.ge_configs[group_name])
+                    allocation.ge_courses[group_name] = section.courses
+
+                if course in section.members:
+                    ge_overlapped.append(course)
+                elif section.is_full():
+                    ge_overflow.append(course)
+                elif group_name in GROUP_3_TO_8_TITLES and len(section.courses) == 1:
+                    ge_overlapped.append(course)
+                elif not section.has_free_row():
+                    ge_overflow.append(course)
+                else:
+                    allocation.slots.append(Slot(section.next_row, course, "ge", group_name))
+                    section.add(course)
+                continue
+
+            ### Specialized Major Courses ###
+            match = self.classifier.specialized_group(course.code)
+            if match is not None:
+                group_name, slot_row = match
+                config = self.specialized_configs[group_name]
+
+                if not config["show_all"] and course.grade is None:
+                    continue
+
+                section = specialized_sections.get(group_name)
+                if section is None:
+                    section = specialized_sections[group_name] = _Section(config)
+                    allocation.specialized_courses[group_name] = section.courses
+
+                # show_all groups list every course on its own fixed row
+                row = slot_row if config["show_all"] else section.next_row
+
+                if course in section.members:
+                    specialized_overlapped.append(course)
+                elif section.is_full() or (not config["show_all"] and not section.has_free_row()):
+                    specialized_overflow.append(course)
+                else:
+                    allocation.slots.append(Slot(row, course, "specialized", group_name))
+                    section.add(course)
+                continue
+
+            ### Neither: free elective candidates ###
+            if course not in unclassified_seen:
+                unclassified_seen.add(course)
+                unclassified.append(course)
+
+        flush_free_candidates()
+
+        # Repeated courses go below the false courses
+        for course in ge_overlapped + specialized_overlapped:
+            allocation.slots.append(Slot(false_section.next_row, course, "overlapped"))
+            false_section.add(course)
+            allocation.overlapped_courses.append(course)
+
+        return allocation
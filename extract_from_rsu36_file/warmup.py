@@ -0,0 +1,68 @@
+import base64
+import glob
+import io
+import logging
+import os
+import zlib
+
+from extract_from_rsu36_file.config_registry import COURSE_PLAN_FRAME_DIR, DATABASE_DIR, registry
+from extract_from_rsu36_file.instrumentation import span
+from extract_from_rsu36_file.xlsx_patcher import compiled_template
+
+logger = logging.getLogger(__name__)
+
+# A two-course synthetic RSU36 form (zlib + base64, 2611 bytes unpacked),
+# made with benchmarks.synthetic_pdfs.make_rsu36_pdf
+_WARMUP_PDF = (
+    "eNrtll+IG0Ucx7FSPNbC1VJf+jQPDVTw3N3Z3WTnCClNcrG117vzcrXaP8hkM0m2JLtxd3LeCX0o"
+    "rRb15RDEFkSkVCiUtg/1QMQ+iaB4JYe1UhE99GixoIgPrX9oi/ObSePZ9c1HL2SSz/7m95vfd36/"
+    "zWxSE8XSkPmEraV+WO5e1kxkoLByUMtmkT7KgjpvIGwaSC/5Tc4i8d2knBWZF1YZyuW0mEeMtrSZ"
+    "tw91L42tMTe+8v3FPb8OdR68c/iFZ187fPTsrQ0DD587uW546gT5pHz645kLC6e9L9d/6Edf/EZu"
+    "XH136+65NbUHUsXxgVOT82+dWP5z+dqn3a+/+mb7o2++97n39Pkt3snja38Ziscyxs7RhSu/v75p"
+    "/o27R4PL7x/Z//jVvYPtR975zpprZV/M3VmaHLj91LGbw9fpQ5tfbXRfnv9sfG/rmfkzh56LNk9f"
+    "uf7zj4OXnj8+uzR6d/2GG3p+cDhfmQ5PzS1+cOSnMxR/tPjYtx3twrEnycTiUnd84Y/WNY0F1d7m"
+    "BEFF8IrKTM22mahFGHCklzsVLi/BaCI9T2OmZraz5jTjvkehUr1VrGR9nQxZUUq9sKO4I/BF+EQU"
+    "emXGUc0PqhGLw07kMVRhdT9AJkZV3+O9K/nptWhbBO+i7THaEmrKswFvQPahqQb1UZXVkJyV0jFc"
+    "i16rSNHLuE09FtGgzlDWMHIoWyrlkJD8zzkNuyqkUvMaNNKyLrgaI4aZE2wqtoGx4gywpdgFthUX"
+    "gR3JpvRPK3aAM4plrKuYABPF24C3Kc4D5xUXgAuSsdRTVIyBRxRbwCXFkIso/RhyEaUfg06i9GPI"
+    "RZR+DLmI0o9BP1H6LQNY6bcgF1H6LdgXUfpt6aP026CNKP229Ff6bUveI73KQulFQ1G/n14niljA"
+    "ZddlH6GDfsD6N0Y7bEPDYCTvXfs/3Lvipx/FvCBUiUX0Udpj7DhI3+NXeSNG+xzHQKtjdayO/+U4"
+    "IA6QcHfgy38F8ISbXPHEcxJnzwSty0840FBauuu7WNWn+XAG7TOEwSEOcm0s1p3snW8xgnh5Nkkw"
+    "EVaBJYzsXkZ46wXhItaNkXmfjvS/6oiRvtOvwhEG7gcgviNymCsCM4nAAuW0GdbvrZC+L9NMJB6u"
+    "BnI1o/9CacexHFRDfZspEsqZoG/DJJOwWemkjST9sGkn1sPYNRM2y3L/tvGI+k0WyZ2V/ZcYckXB"
+    "w5CjzL0dxZxGXO4HW25GS6VGxkvaXyS8lvY="
+)
+
+
+def warmup_pdf():
+    return zlib.decompress(base64.b64decode(_WARMUP_PDF))
+
+
+def warm_up(parse=True):
+    """
+    Pay the one-time startup costs before the first real upload: parse every
+    rule config, compile the course plan templates and, with `parse`, run the
+    whole pipeline once on a tiny embedded form (pdfium, the default backend),
+    then extract it again with pdfplumber so the fallback backend's imports
+    and pdfminer's font and encoding tables are loaded too.
+    Returns False (and logs why) instead of raising.
+    """
+    try:
+        with span("warmup", parse=parse):
+            for path in glob.glob(os.path.join(DATABASE_DIR, "*.json")):
+                registry.get(os.path.splitext(os.path.basename(path))[0])
+            registry.version()
+
+            for path in glob.glob(os.path.join(COURSE_PLAN_FRAME_DIR, "*.xlsx")):
+                compiled_template(path)
+
+            if parse:
+                from extract_from_rsu36_file.course_extractor import CourseExtractor
+                from extract_from_rsu36_file.pipeline import run_pipeline
+                run_pipeline(io.BytesIO(warmup_pdf()))
+                CourseExtractor().extract_from_rsu36(warmup_pdf(), backend="pdfplumber")
+    except Exception:
+        logger.exception("Warm-up failed")
+        return False
+
+    return True
@@ -0,0 +1,298 @@
+import io
+import os
+import posixpath
+import re
+import struct
+import threading
+import zipfile
+import zlib
+
+ROW_PATTERN = re.compile(rb'<row r="(\d+)"[^>]*?(?:/>|>.*?</row>)', re.S)
+CELL_PATTERN = re.compile(rb'<c r="([A-Z]+)(\d+)"[^>]*?(?:/>|>.*?</c>)', re.S)
+SPANS_PATTERN = re.compile(rb'\sspans="[^"]*"')
+COL_PATTERN = re.compile(rb'<col\s[^>]*?/>')
+FORMULA_CACHE_PATTERN = re.compile(rb'(</f>|<f\s[^>]*?/>)<v>[^<]*</v>')
+DIMENSION_PATTERN = re.compile(rb'<dimension ref="[^"]*"/>')
+
+# zip record layouts (same as the zipfile module's)
+LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+CENTRAL_HEADER = struct.Struct("<4s4B4HL2L5H2L")
+END_OF_CENTRAL_DIR = struct.Struct("<4s4H2LH")
+
+
+# Same as openpyxl.utils' column helpers, without importing openpyxl
+def _column_index(letters):
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - 64
+    return index
+
+
+def _column_letter(index):
+    letters = ""
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _escape(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _attribute(tag, name):
+    match = re.search(rb'\s' + name + rb'="([^"]*)"', tag)
+    return match.group(1) if match else None
+
+
+def _cell_xml(ref, style, value):
+    """One <c> element; strings are written inline so sharedStrings.xml stays untouched."""
+    style_attr = b' s="' + style + b'"' if style else b""
+
+    if value is None:
+        return b'<c r="' + ref + b'"' + style_attr + b'/>'
+
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return b'<c r="' + ref + b'"' + style_attr + b'><v>' + repr(value).encode("ascii") + b'</v></c>'
+
+    text = _escape(str(value)).encode("utf-8")
+    space = b' xml:space="preserve"' if text[:1].isspace() or text[-1:].isspace() else b""
+    return b'<c r="' + ref + b'"' + style_attr + b' t="inlineStr"><is><t' + space + b'>' + text + b'</t></is></c>'
+
+
+class _Member:
+    """A zip member kept in its compressed form, ready to be copied as is."""
+
+    def __init__(self, info, compressed):
+        self.name = info.filename.encode("utf-8")
+        self.flag_bits = 0x800 if info.flag_bits & 0x800 else 0
+        self.compress_type = info.compress_type
+        self.date_time = info.date_time
+        self.external_attr = info.external_attr
+        self.crc = info.CRC
+        self.file_size = info.file_size
+        self.compressed = compressed
+
+    @classmethod
+    def from_bytes(cls, info, data):
+        compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+        member = cls(info, compressor.compress(data) + compressor.flush())
+        member.compress_type = zipfile.ZIP_DEFLATED
+        member.crc = zlib.crc32(data)
+        member.file_size = len(data)
+        return member
+
+    @property
+    def dos_time(self):
+        year, month, day, hour, minute, second = self.date_time
+        return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+
+
+def _read_compressed(f, info):
+    f.seek(info.header_offset)
+    header = LOCAL_HEADER.unpack(f.read(LOCAL_HEADER.size))
+    f.seek(header[-2] + header[-1], os.SEEK_CUR)  # file name + extra field
+    return f.read(info.compress_size)
+
+
+def _write_zip(out, members):
+    central = []
+    offset = 0
+    for member in members:
+        time, date = member.dos_time
+        header = LOCAL_HEADER.pack(
+            b"PK\x03\x04", 20, 0, member.flag_bits, member.compress_type, time, date,
+            member.crc, len(member.compressed), member.file_size, len(member.name), 0
+        )
+        central.append(CENTRAL_HEADER.pack(
+            b"PK\x01\x02", 20, 0, 20, 0, member.flag_bits, member.compress_type, time, date,
+            member.crc, len(member.compressed), member.file_size, len(member.name), 0, 0, 0, 0,
+            member.external_attr, offset
+        ) + member.name)
+        out.append(header)
+        out.append(member.name)
+        out.append(member.compressed)
+        offset += len(header) + len(member.name) + len(member.compressed)
+
+    central_dir = b"".join(central)
+    out.append(central_dir)
+    out.append(END_OF_CENTRAL_DIR.pack(b"PK\x05\x06", 0, 0, len(members), len(members), len(central_dir), offset, 0))
+
+
+class CompiledTemplate:
+    """
+    A course plan template split once into its zip members and the rows of its
+    first worksheet. render() copies every untouched member byte for byte
+    (still compressed) and only rebuilds the worksheet rows that get values.
+
+    The workbook is flagged for a full recalculation on open and the cached
+    results of the template's formulas are dropped, since the totals they
+    compute change with the filled cells.
+    """
+
+    def __init__(self, path):
+        """path: a template path, or the bytes of a workbook to patch (such as a rendered plan)."""
+        self.path = path
+
+        with (io.BytesIO(path) if isinstance(path, bytes) else open(path, "rb")) as f, zipfile.ZipFile(f) as archive:
+            infos = archive.infolist()
+            self.sheet_name = self._first_sheet_name(archive)
+
+            self._members = []
+            self._sheet_index = None
+            for info in infos:
+                if info.filename == self.sheet_name:
+                    self._sheet_index = len(self._members)
+                    self._sheet_info = info
+                    self._members.append(None)
+                elif info.filename == "xl/workbook.xml":
+                    workbook = archive.read(info)
+                    patched = self._full_calc_on_load(workbook)
+                    if patched is workbook:  # already set, e.g. a previously rendered plan
+                        self._members.append(_Member(info, _read_compressed(f, info)))
+                    else:
+                        self._members.append(_Member.from_bytes(info, patched))
+                else:
+                    self._members.append(_Member(info, _read_compressed(f, info)))
+
+            self._compile_sheet(archive.read(self.sheet_name))
+
+    @staticmethod
+    def _first_sheet_name(archive):
+        workbook = archive.read("xl/workbook.xml")
+        rel_id = _attribute(re.search(rb"<sheet\s[^>]*/>", workbook).group(0), rb"r:id")
+        rels = archive.read("xl/_rels/workbook.xml.rels")
+        for relationship in re.findall(rb"<Relationship\s[^>]*/>", rels):
+            if _attribute(relationship, rb"Id") == rel_id:
+                target = _attribute(relationship, rb"Target").decode("utf-8")
+                if target.startswith("/"):
+                    return target[1:]
+                return posixpath.normpath(posixpath.join("xl", target))
+        raise ValueError(f"Worksheet {rel_id!r} not found in the workbook")
+
+    @staticmethod
+    def _full_calc_on_load(workbook):
+        calc_pr = re.search(rb"<calcPr\b[^>]*?/?>", workbook)
+        if calc_pr is None:
+            return workbook.replace(b"</sheets>", b'</sheets><calcPr fullCalcOnLoad="1"/>', 1)
+        if b"fullCalcOnLoad" in calc_pr.group(0):
+            return workbook
+        return workbook[:calc_pr.start() + len(b"<calcPr")] + b' fullCalcOnLoad="1"' + workbook[calc_pr.start() + len(b"<calcPr"):]
+
+    def _compile_sheet(self, sheet):
+        sheet = FORMULA_CACHE_PATTERN.sub(rb"\1", sheet)
+
+        if b"<sheetData/>" in sheet:
+            sheet = sheet.replace(b"<sheetData/>", b"<sheetData></sheetData>")
+        start = sheet.index(b"<sheetData>") + len(b"<sheetData>")
+        end = sheet.index(b"</sheetData>")
+
+        self._head = sheet[:start]
+        self._tail = sheet[end:]
+
+        # row number -> original row XML, in sheet order
+        self._rows = {int(m.group(1)): m.group(0) for m in ROW_PATTERN.finditer(sheet, start, end)}
+        self._row_order = list(self._rows)
+
+        # Styles new cells inherit in Excel: the row's, else the column's
+        self._row_styles = {}
+        for number, row in self._rows.items():
+            open_tag = row[:row.index(b">") + 1]
+            if _attribute(open_tag, rb"customFormat") == b"1":
+                self._row_styles[number] = _attribute(open_tag, rb"s")
+
+        self._col_styles = []
+        for col in COL_PATTERN.findall(self._head):
+            style = _attribute(col, rb"style")
+            if style is not None:
+                self._col_styles.append((int(_attribute(col, rb"min")), int(_attribute(col, rb"max")), style))
+
+        dimension = DIMENSION_PATTERN.search(self._head)
+        self._dimension = _attribute(dimension.group(0), rb"ref").decode("ascii") if dimension else None
+
+    def _default_style(self, row, col):
+        style = self._row_styles.get(row)
+        if style is not None:
+            return style
+        for low, high, col_style in self._col_styles:
+            if low <= col <= high:
+                return col_style
+        return None
+
+    def _patch_row(self, row, values):
+        """values: {col index: value} -> the row's XML with those cells replaced."""
+        original = self._rows.get(row)
+        cells = {}
+        if original is None:
+            open_tag = b'<row r="%d">' % row
+        else:
+            open_tag = original[:original.index(b">") + 1]
+            if open_tag.endswith(b"/>"):
+                open_tag = open_tag[:-2] + b">"
+            open_tag = SPANS_PATTERN.sub(b"", open_tag)
+            for m in CELL_PATTERN.finditer(original, len(open_tag)):
+                cells[_column_index(m.group(1).decode("ascii"))] = m.group(0)
+
+        for col, value in values.items():
+            existing = cells.get(col)
+            if existing is not None:
+                style = _attribute(existing[:existing.index(b">") + 1], rb"s")
+            else:
+                style = self._default_style(row, col)
+            ref = f"{_column_letter(col)}{row}".encode("ascii")
+            cells[col] = _cell_xml(ref, style, value)
+
+        return open_tag + b"".join(cells[col] for col in sorted(cells)) + b"</row>"
+
+    def render_sheet(self, cells):
+        """cells: {(row, col): value} -> worksheet XML bytes."""
+        by_row = {}
+        for (row, col), value in cells.items():
+            by_row.setdefault(row, {})[col] = value
+
+        patched = {row: self._patch_row(row, values) for row, values in by_row.items()}
+
+        order = self._row_order
+        new_rows = [row for row in patched if row not in self._rows]
+        if new_rows:
+            order = sorted(order + new_rows)
+
+        head = self._head
+        if new_rows and self._dimension is not None:
+            first, _, last = self._dimension.partition(":")
+            last = last or first
+            last_col = max(_column_index(last.rstrip("0123456789")), *(col for _, col in cells))
+            last_row = max(int(last.lstrip("ABCDEFGHIJKLMNOPQRSTUVWXYZ")), *new_rows)
+            head = DIMENSION_PATTERN.sub(f'<dimension ref="{first}:{_column_letter(last_col)}{last_row}"/>'.encode("ascii"), head, 1)
+
+        rows = self._rows
+        return head + b"".join(patched.get(row) or rows[row] for row in order) + self._tail
+
+    def render(self, cells):
+        """cells: {(row, col): value} -> the filled .xlsx file as bytes."""
+        members = list(self._members)
+        members[self._sheet_index] = _Member.from_bytes(self._sheet_info, self.render_sheet(cells))
+
+        out = []
+        _write_zip(out, members)
+        return b"".join(out)
+
+
+_compiled = {}  # path -> (mtime_ns, CompiledTemplate)
+_compiled_lock = threading.Lock()
+
+
+def compiled_template(path):
+    """The CompiledTemplate for `path`, recompiled when the file changes."""
+    mtime = os.stat(path).st_mtime_ns
+
+    entry = _compiled.get(path)
+    if entry is not None and entry[0] == mtime:
+        return entry[1]
+
+    with _compiled_lock:
+        entry = _compiled.get(path)
+        if entry is None or entry[0] != mtime:
+            entry = _compiled[path] = (mtime, CompiledTemplate(path))
+
+    return entry[1]
@@ -0,0 +1,213 @@
+import argparse
+import json
+import sys
+import time
+from email.parser import BytesParser
+from email.policy import default as default_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from extract_from_rsu36_file.job_queue import JobQueue, JobTimeoutError, QueueFullError, plan_result_job
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+CSV_MIME = "text/csv; charset=utf-8"
+
+
+def parse_multipart(content_type, body):
+    """Return [(filename, bytes)] for every file part of a multipart/form-data body."""
+    message = BytesParser(policy=default_policy).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+    )
+    files = []
+    for part in message.iter_parts():
+        filename = part.get_filename()
+        if filename is not None:
+            files.append((filename, part.get_payload(decode=True)))
+    return files
+
+
+class ExtractionRequestHandler(BaseHTTPRequestHandler):
+    """
+    POST /extract?format=json|csv|xlsx   one PDF, raw body or multipart "file" field
+    POST /extract/batch              many PDFs as multipart form files, JSON results
+    GET  /health                     worker pool status
+    """
+
+    server_version = "CoursePlanExtractor/1.0"
+
+    def do_GET(self):
+        if urlparse(self.path).path != "/health":
+            return self._send_json(404, {"error": "not found"})
+        self._send_json(200, {"status": "ok", **self.server.job_queue.stats()})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        body = self._read_body()
+        if body is None:
+            return
+
+        if url.path == "/extract":
+            self._extract_one(body, query.get("format", ["json"])[0])
+        elif url.path == "/extract/batch":
+            self._extract_batch(body)
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def _read_body(self):
+        length = self.headers.get("Content-Length")
+        if length is None:
+            self._send_json(411, {"error": "Content-Length required"})
+            return None
+
+        try:
+            length = int(length)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._send_json(400, {"error": "invalid Content-Length"})
+            return None
+        if length > self.server.max_body_bytes:
+            self._send_json(413, {"error": f"request larger than {self.server.max_body_bytes} bytes"})
+            return None
+
+        return self.rfile.read(length)
+
+    def _uploaded_files(self, body):
+        content_type = self.headers.get("Content-Type", "")
+        if content_type.startswith("multipart/form-data"):
+            return parse_multipart(content_type, body)
+        return [("upload.pdf", body)]
+
+    def _extract_one(self, body, output_format):
+        if output_format not in ("json", "csv", "xlsx"):
+            return self._send_json(400, {"error": "format must be json, csv or xlsx"})
+
+        files = self._uploaded_files(body)
+        if len(files) != 1:
+            return self._send_json(400, {"error": "expected exactly one PDF file"})
+
+        job_queue = self.server.job_queue
+        try:
+            # Only xlsx needs the template filled; json and csv skip the workbook
+            if output_format == "xlsx":
+                job_id = job_queue.submit(files[0][1])
+            else:
+                job_id = job_queue.submit(files[0][1], fn=plan_result_job)
+        except QueueFullError as e:
+            return self._send_json(503, {"error": str(e)}, {"Retry-After": str(e.retry_after)})
+
+        try:
+            result = job_queue.wait(job_id, timeout=self.server.request_timeout)
+        except JobTimeoutError:
+            return self._send_json(504, {"error": "extraction timed out"})
+        except Exception as e:
+            return self._send_json(422, {"error": f"could not extract course plan: {type(e).__name__}: {e}"})
+
+        if output_format == "xlsx":
+            information = result[1]
+            file_name = f"{information['student_id']}_course_plan.xlsx"
+            return self._send(200, result[0], XLSX_MIME, {"Content-Disposition": f'attachment; filename="{file_name}"'})
+
+        if output_format == "csv":
+            return self._send(200, result.to_csv().encode("utf-8"), CSV_MIME)
+
+        self._send_json(200, result.to_dict())
+
+    def _extract_batch(self, body):
+        files = self._uploaded_files(body)
+        if not files:
+            return self._send_json(400, {"error": "no PDF files in request"})
+        if len(files) > self.server.max_batch_files:
+            return self._send_json(413, {"error": f"at most {self.server.max_batch_files} files per batch"})
+
+        job_queue = self.server.job_queue
+        jobs = []
+        for filename, data in files:
+            try:
+                jobs.append((filename, job_queue.submit(data, fn=plan_result_job), None))
+            except QueueFullError as e:
+                jobs.append((filename, None, str(e)))
+
+        # One deadline for the whole batch
+        deadline = time.monotonic() + self.server.request_timeout
+        results = []
+        for filename, job_id, error in jobs:
+            if job_id is not None:
+                try:
+                    result = job_queue.wait(job_id, timeout=max(0, deadline - time.monotonic()))
+                    results.append({"filename": filename, "ok": True, **result.to_dict()})
+                    continue
+                except JobTimeoutError:
+                    error = "extraction timed out"
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+            results.append({"filename": filename, "ok": False, "error": error})
+
+        self._send_json(200, {
+            "succeeded": sum(1 for r in results if r["ok"]),
+            "failed": sum(1 for r in results if not r["ok"]),
+            "results": results,
+        })
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        self._send(status, body, "application/json; charset=utf-8", headers)
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class ExtractionServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, job_queue, max_body_bytes, max_batch_files, request_timeout):
+        super().__init__(address, ExtractionRequestHandler)
+        self.job_queue = job_queue
+        self.max_body_bytes = max_body_bytes
+        self.max_batch_files = max_batch_files
+        self.request_timeout = request_timeout
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP service that turns RSU36 PDFs into course plans.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--max-queue", type=int, default=64, help="Jobs allowed to wait for a worker")
+    parser.add_argument("--max-upload-mb", type=float, default=10, help="Maximum request body size")
+    parser.add_argument("--max-batch-files", type=int, default=100)
+    parser.add_argument("--timeout", type=float, default=60, help="Per-request timeout in seconds")
+    args = parser.parse_args(argv)
+
+    job_queue = JobQueue(max_in_flight=args.workers, max_queue=args.max_queue)
+    job_queue.start_workers()
+    server = ExtractionServer(
+        (args.host, args.port),
+        job_queue,
+        max_body_bytes=int(args.max_upload_mb * 1024 * 1024),
+        max_batch_files=args.max_batch_files,
+        request_timeout=args.timeout,
+    )
+
+    print(f"Serving on http://{args.host}:{args.port} with {job_queue.max_in_flight} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        job_queue.shutdown()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
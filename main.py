@@ -1,12 +1,23 @@
 import streamlit as st
+from extract_from_rsu36_file import instrumentation
+from streamlit_resources import warm_up_server
+
+# Once per server process: configs, templates and warm extraction workers
+warm_up_server()
 
 # Define pages with custom labels
-pg = st.navigation([
+pages = [
     st.Page("pages/extract.py", title="Extract"),
     st.Page("pages/course_plan_viewer.py", title="Extracted Tables"),
     st.Page("pages/about.py", title="About"),
     st.Page("pages/tutorial.py", title="RSU36 File"),
-])
+]
+
+# Admin page only shows up when tracing is turned on (COURSE_PLAN_TRACE=1)
+if instrumentation.is_enabled():
+    pages.append(st.Page("pages/admin.py", title="Admin"))
+
+pg = st.navigation(pages)
 
 # Run the navigation
 pg.run()
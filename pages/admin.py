@@ -0,0 +1,40 @@
+import streamlit as st
+
+from extract_from_rsu36_file import instrumentation
+
+st.title("Pipeline Timings")
+
+if not instrumentation.is_enabled():
+    st.info("Tracing is disabled. Start the app with `COURSE_PLAN_TRACE=1` to record pipeline timings.")
+    st.stop()
+
+summary = instrumentation.histogram.snapshot()
+
+if not summary:
+    st.info("No spans recorded yet. Extract a course plan first.")
+    st.stop()
+
+import pandas as pd
+
+st.subheader("Spans (this server process)")
+rows = [
+    {
+        "Span": name,
+        "Count": stats["count"],
+        "Mean (ms)": round(stats["mean_ms"], 2),
+        "p50 (ms)": round(stats["p50_ms"], 2),
+        "p90 (ms)": round(stats["p90_ms"], 2),
+        "p99 (ms)": round(stats["p99_ms"], 2),
+        "Max (ms)": round(stats["max_ms"], 2),
+    }
+    for name, stats in summary.items()
+]
+st.dataframe(pd.DataFrame(rows), hide_index=True)
+
+st.subheader("Histogram")
+span_name = st.selectbox("Span", list(summary.keys()))
+st.bar_chart(pd.Series(summary[span_name]["buckets"], name="count"))
+
+if st.button("Reset"):
+    instrumentation.histogram.reset()
+    st.rerun()
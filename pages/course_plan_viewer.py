@@ -1,9 +1,8 @@
 import streamlit as st
-import pandas as pd
 
-def courses_to_dict(courses: list[dict]) -> dict:
+def courses_to_dict(courses: list) -> dict:
     """
-    Convert list of course dicts into a dict of lists,
+    Convert list of course records into a dict of lists,
     using column mapping (with names and order).
     """
 
@@ -19,7 +18,7 @@ def courses_to_dict(courses: list[dict]) -> dict:
     # Respect order defined in col_map["col"]
     for key in sorted(col_map.keys(), key=lambda k: col_map[k]["col"]):
         col_name = col_map[key]["name"]
-        result[col_name] = [str(c.get(key, None)) for c in courses]
+        result[col_name] = [str(getattr(c, key, None)) for c in courses]
 
     return result
 
@@ -38,6 +37,9 @@ if st.session_state['course_plan_data']['ge_courses'] is None or \
     st.page_link("pages/extract.py", label="Go to Extract")
     st.stop()
 
+# Only needed once there is something to show
+import pandas as pd
+
 ge_courses = st.session_state['course_plan_data']['ge_courses']
 specialized_courses = st.session_state['course_plan_data']['specialized_courses']
 information = st.session_state['course_plan_data']['information']
@@ -1,6 +1,6 @@
 import streamlit as st
-from extract_from_rsu36_file.course_extractor import CourseExtractor
-from extract_from_rsu36_file.course_plan_fitter import CoursePlanFitter
+from extract_from_rsu36_file.job_queue import JobQueue, QueueFullError
+from streamlit_resources import get_job_queue, get_result_cache
 import time
 
 st.title("Course Plan Extractor")
@@ -12,6 +12,13 @@ st.info("""
 Currently working only for ICT (Information and Communication Technology) major.
 """)
 
+def store_result(result):
+    excel_file, information, ge_courses, specialized_courses = result
+    st.session_state['course_plan_data']['excel'] = excel_file
+    st.session_state['course_plan_data']['information'] = information
+    st.session_state['course_plan_data']['ge_courses'] = ge_courses
+    st.session_state['course_plan_data']['specialized_courses'] = specialized_courses
+
 def reset_session_state():
     st.session_state['course_plan_data'] = {
         'excel': None,
@@ -23,24 +30,53 @@ def reset_session_state():
 if 'course_plan_data' not in st.session_state:
     reset_session_state()
 
+if st.session_state.get('extract_job') is not None:
+    # Extraction runs in a worker process; poll until it finishes
+    job = st.session_state['extract_job']
+    job_queue = get_job_queue()
+    status = job_queue.status(job['id'])
+
+    if status in (JobQueue.QUEUED, JobQueue.RUNNING):
+        st.info("Waiting for a free worker..." if status == JobQueue.QUEUED else "Extracting your course plan...")
+        time.sleep(0.5)
+        st.rerun()
+
+    st.session_state['extract_job'] = None
+
+    if status is None:
+        st.error("The extraction job expired. Please extract again.")
+    else:
+        try:
+            result = job_queue.pop_result(job['id'])
+        except Exception:
+            st.error("Could not extract a course plan from this file. Please check that it is an RSU36 form.")
+        else:
+            get_result_cache().put(job['key'], result)
+            store_result(result)
+            st.rerun()
+
 if st.session_state['course_plan_data']['excel'] is None:
     
     uploaded_file = st.file_uploader("Select your RSU36 file:", type=["pdf"], )
 
     if st.button("Extract"):
-        if uploaded_file is not None:            
-            extractor = CourseExtractor()
-            data = extractor.extract_from_rsu36(file=uploaded_file)
-            
-            fitter = CoursePlanFitter()
-            fitter.fit(data)
-
-            excel_file, information, ge_courses, specialized_courses = fitter.generate_excel_file(is_web=True)
-            st.session_state['course_plan_data']['excel'] = excel_file
-            st.session_state['course_plan_data']['information'] = information
-            st.session_state['course_plan_data']['ge_courses'] = ge_courses
-            st.session_state['course_plan_data']['specialized_courses'] = specialized_courses
-            st.rerun()
+        if uploaded_file is not None:
+            file_bytes = uploaded_file.getvalue()
+            cache = get_result_cache()
+            key = cache.make_key(file_bytes)
+
+            result = cache.get(key)
+            if result is not None:
+                store_result(result)
+                st.rerun()
+
+            try:
+                job_id = get_job_queue().submit(file_bytes)
+            except QueueFullError as e:
+                st.warning(f"The server is busy right now. Please try again in {e.retry_after} seconds.")
+            else:
+                st.session_state['extract_job'] = {'id': job_id, 'key': key}
+                st.rerun()
 
         else:
             empty_container = st.empty()
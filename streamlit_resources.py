@@ -0,0 +1,37 @@
+import os
+
+import streamlit as st
+
+from extract_from_rsu36_file.job_queue import JobQueue
+from extract_from_rsu36_file.result_cache import ResultCache
+
+# Created once per server process and shared by every page and session
+
+
+@st.cache_resource
+def get_result_cache():
+    # Set COURSE_PLAN_CACHE_DIR to also keep results on disk across restarts
+    return ResultCache(disk_dir=os.environ.get("COURSE_PLAN_CACHE_DIR"))
+
+
+@st.cache_resource
+def get_job_queue():
+    job_queue = JobQueue(
+        max_in_flight=int(os.environ.get("COURSE_PLAN_WORKERS", 0)) or None,
+        max_queue=int(os.environ.get("COURSE_PLAN_MAX_QUEUE", 32))
+    )
+    # Spawn and warm the workers now rather than on the first upload
+    job_queue.start_workers()
+    return job_queue
+
+
+@st.cache_resource
+def warm_up_server():
+    """Load configs and templates in this process and start the extraction workers."""
+    from extract_from_rsu36_file.warmup import warm_up
+
+    # Extraction itself runs in the workers, so no PDF parsing here
+    warm_up(parse=False)
+    get_result_cache()
+    get_job_queue()
+    return True